@@ -3,15 +3,16 @@
 탭 구조: 홈 | AI 검사 | 프로젝트 소개 | 핵심 코드 설명
 """
 import os
+import hashlib
 # Windows 콘솔 인코딩 문제 해결
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
 import streamlit as st
 import config
 from utils.imaging import load_image
+from explainers.gradcam import LazyCamImage
 from datetime import datetime
 import plotly.graph_objects as go
-import pandas as pd
 
 # 페이지 설정
 st.set_page_config(
@@ -223,6 +224,9 @@ with tab2:
     st.markdown("---")
     
     img = None
+    image_key = None  # 같은 이미지인지 구분하는 키 (재실행 시 검사 결과 재사용)
+    # 모델 입력(IMAGE_SIZE)의 2배 이상 해상도로만 디코딩 (JPEG 축소 디코딩, 화면/보고서 표시에도 충분)
+    decode_size = (2 * config.IMAGE_SIZE[0], 2 * config.IMAGE_SIZE[1])
     
     if test_mode == "🎯 샘플 이미지":
         # 샘플 이미지 딕셔너리 (간단하게 통합)
@@ -245,8 +249,8 @@ with tab2:
         )
         
         # 샘플 이미지 로드
-        from PIL import Image
-        img = Image.open(sample_images[selected_sample])
+        img = load_image(sample_images[selected_sample], max_size=decode_size)
+        image_key = sample_images[selected_sample]
         st.success(f"✅ 선택 완료: {selected_sample}")
     
     else:  # 파일 업로드 모드
@@ -257,7 +261,8 @@ with tab2:
         )
         
         if uploaded_file:
-            img = load_image(uploaded_file)
+            img = load_image(uploaded_file, max_size=decode_size)
+            image_key = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
     
     # 이미지가 선택되었을 때 (업로드 or 샘플)
     if img is not None:
@@ -278,14 +283,25 @@ with tab2:
         progress_bar.progress(50)
         
         # 오케스트레이터로 전체 검사 실행
-        result = orchestrator.run_inspection(img)
+        # Streamlit은 체크박스/버튼을 누를 때마다 스크립트를 다시 실행하므로 같은 이미지는 한 번만 검사
+        # (이력/페이로드 중복 기록과 불필요한 재추론 방지)
+        inspection = st.session_state.get('inspection')
+        if inspection is None or inspection['key'] != image_key:
+            inspection = {'key': image_key, 'result': orchestrator.run_inspection(img)}
+            st.session_state['inspection'] = inspection
+        result = inspection['result']
         cam_img = result['cam_image']
         
         progress_bar.progress(70)
         
         with col2:
             st.markdown("#### 🔥 Grad-CAM 히트맵")
-            st.image(cam_img, use_container_width=True, caption="AI 판단 근거 시각화")
+            if isinstance(cam_img, LazyCamImage) and not cam_img.is_ready:
+                # EXPLAIN_POLICY에 따라 생략된 경우 요청 시에만 생성
+                if st.checkbox("Grad-CAM 히트맵 생성", key="show_lazy_cam"):
+                    cam_img = orchestrator.get_cam_image(result)
+            if not isinstance(cam_img, LazyCamImage):
+                st.image(cam_img, use_container_width=True, caption="AI 판단 근거 시각화")
             
             # 컬러 스펙트럼 설명
             st.markdown("**🎨 컬러 스펙트럼 가이드**")
@@ -401,18 +417,32 @@ with tab2:
         
         # AI 상세 분석
         if st.button("🚀 Claude AI 상세 분석 리포트 생성", type="primary", use_container_width=True):
-            with st.spinner("🤖 Claude AI가 결함을 분석하고 있습니다..."):
-                report = orchestrator.generate_ai_analysis(result)
+            if config.LLM_STREAMING:
+                st.markdown("---")
+                st.markdown("### 📊 AI 분석 리포트")
+                report_placeholder = st.empty()
                 
-            st.markdown("---")
-            st.markdown("### 📊 AI 분석 리포트")
-            
-            # 보고서를 예쁘게 표시
-            st.markdown(f"""
-            <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; border-left: 5px solid #1f4788;">
-            {report}
-            </div>
-            """, unsafe_allow_html=True)
+                # 생성되는 대로 리포트를 갱신하여 표시
+                with st.spinner("🤖 Claude AI가 결함을 분석하고 있습니다..."):
+                    for report in orchestrator.generate_ai_analysis_stream(result):
+                        report_placeholder.markdown(f"""
+                        <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; border-left: 5px solid #1f4788;">
+                        {report}
+                        </div>
+                        """, unsafe_allow_html=True)
+            else:
+                with st.spinner("🤖 Claude AI가 결함을 분석하고 있습니다..."):
+                    report = orchestrator.generate_ai_analysis(result)
+                    
+                st.markdown("---")
+                st.markdown("### 📊 AI 분석 리포트")
+                
+                # 보고서를 예쁘게 표시
+                st.markdown(f"""
+                <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; border-left: 5px solid #1f4788;">
+                {report}
+                </div>
+                """, unsafe_allow_html=True)
             
             # PDF 생성
             st.markdown("---")
@@ -456,7 +486,6 @@ with tab3:
     
     # 통계 가져오기 (오케스트레이터 사용)
     stats = orchestrator.get_statistics(days=selected_days)
-    df_history = orchestrator.get_history(days=selected_days)
     
     st.markdown("---")
     
@@ -495,13 +524,12 @@ with tab3:
     
     st.markdown("---")
     
-    if not df_history.empty:
+    if stats['total'] > 0:
         # 시간대별 검사 추이
         st.markdown("### 📈 시간대별 검사 추이")
         
-        # 시간대별 집계
-        df_history['hour'] = pd.to_datetime(df_history['timestamp']).dt.hour
-        hourly_counts = df_history.groupby(['hour', 'class_name']).size().unstack(fill_value=0)
+        # 시간대별 집계 (롤업 사용)
+        hourly_counts = orchestrator.get_hourly_counts(days=selected_days)
         
         fig_trend = go.Figure()
         
@@ -560,7 +588,7 @@ with tab3:
             st.markdown("### 📋 최근 검사 기록")
             
             # 최근 10건 표시
-            recent_df = df_history.tail(10)[['timestamp', 'class_name', 'confidence']].copy()
+            recent_df = orchestrator.get_recent_records(limit=10, days=selected_days)[['timestamp', 'class_name', 'confidence']].copy()
             recent_df['신뢰도'] = (recent_df['confidence'] * 100).round(1).astype(str) + '%'
             recent_df = recent_df[['timestamp', 'class_name', '신뢰도']]
             recent_df.columns = ['시간', '판정', '신뢰도']
@@ -0,0 +1,65 @@
+"""
+InspectionHistory.add_record() 지연시간 vs 이력 크기 벤치마크
+
+1k ~ 10M 행의 이력 파일을 미리 채운 뒤 add_record() 평균 지연시간을 측정
+(append 방식이면 이력 크기와 무관하게 일정해야 함)
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/bench_history_append.py
+    python benchmarks/bench_history_append.py --sizes 1000 100000 --records 500
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from services.history import InspectionHistory
+
+SAMPLE_RESULT = {
+    'inspection_time': datetime(2024, 1, 1, 9, 0, 0),
+    'prediction': 1,
+    'class_name': config.CLASS_NAMES[1],
+    'confidence': 0.9876,
+    'probabilities': {config.CLASS_NAMES[0]: 0.0124, config.CLASS_NAMES[1]: 0.9876}
+}
+
+
+def prefill(history_file, rows):
+    """헤더 + rows개 행을 블록 단위로 빠르게 기록"""
+    history = InspectionHistory(history_file, backend='csv')
+    line = f"2024-01-01 09:00:00,1,{config.CLASS_NAMES[1]},0.9876,0.0124,0.9876\n"
+    block = line * 100_000
+    with open(history.history_file, 'a', encoding='utf-8') as f:
+        for _ in range(rows // 100_000):
+            f.write(block)
+        f.write(line * (rows % 100_000))
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs='+', default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--records", type=int, default=1000, help="크기별 측정할 add_record 호출 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            history_file = Path(tmp) / f"history_{rows}.csv"
+            history = prefill(history_file, rows)
+
+            start = time.perf_counter()
+            for _ in range(args.records):
+                history.add_record(SAMPLE_RESULT)
+            elapsed_us = (time.perf_counter() - start) / args.records * 1e6
+
+            print(f"{rows:>12,} 행: add_record 평균 {elapsed_us:8.1f} us")
+            history_file.unlink()
+
+
+if __name__ == "__main__":
+    main()
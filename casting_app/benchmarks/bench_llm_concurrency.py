@@ -0,0 +1,104 @@
+"""
+DefectAnalyzer.analyze() 동시 호출 검증
+
+API를 호출하지 않는 스텁 클라이언트에 요청별 지연을 넣고 analyze() 소요 시간을 측정
+(두 요청이 동시에 실행되면 a + b가 아니라 max(a, b)에 가까워야 함)
+여러 세션이 같은 분석기를 동시에 사용해도 각 세션의 소요 시간이 max(a, b)에 가까워야 함
+(조건을 만족하지 않으면 AssertionError로 실패, 종료 코드 1)
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/bench_llm_concurrency.py
+    python benchmarks/bench_llm_concurrency.py --analysis-latency 1.5 --recommendation-latency 0.5
+    python benchmarks/bench_llm_concurrency.py --sessions 8
+"""
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from llm.analyzer import DefectAnalyzer
+from llm.prompt import PromptBuilder
+
+
+class StubClient:
+    """프롬프트 종류별로 정해진 시간만큼 대기한 뒤 고정 응답을 반환하는 클라이언트"""
+
+    def __init__(self, analysis_latency, recommendation_latency):
+        self.analysis_latency = analysis_latency
+        self.recommendation_latency = recommendation_latency
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, max_tokens=None):
+        is_analysis = '판정 요약' in prompt
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            time.sleep(self.analysis_latency if is_analysis else self.recommendation_latency)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        return 'analysis' if is_analysis else 'recommendation'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analysis-latency", type=float, default=1.0)
+    parser.add_argument("--recommendation-latency", type=float, default=0.6)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--sessions", type=int, default=4, help="동시에 analyze()를 호출하는 세션 수")
+    args = parser.parse_args()
+
+    # 스텁이 프롬프트를 구분할 수 있는지 먼저 확인
+    assert '판정 요약' in PromptBuilder.build_defect_analysis_prompt(1, 0.9, config.CLASS_NAMES[1])
+    assert '판정 요약' not in PromptBuilder.build_recommendation_prompt(1, 0.9)
+
+    # 응답 캐시를 거치면 두 번째 실행부터 지연이 측정되지 않으므로 끔
+    config.LLM_CACHE_ENABLED = False
+    client = StubClient(args.analysis_latency, args.recommendation_latency)
+    analyzer = DefectAnalyzer(llm_client=client, mode='separate')
+    result = {'prediction': 1, 'confidence': 0.9, 'class_name': config.CLASS_NAMES[1]}
+
+    sequential = args.analysis_latency + args.recommendation_latency
+    concurrent = max(args.analysis_latency, args.recommendation_latency)
+    limit = concurrent + 0.25 * min(args.analysis_latency, args.recommendation_latency) + 0.05
+    print(f"예상 소요 시간: 순차 {sequential:.2f}s / 동시 {concurrent:.2f}s")
+
+    def timed_analyze(_=None):
+        start = time.perf_counter()
+        output = analyzer.analyze(result)
+        return output, time.perf_counter() - start
+
+    for run in range(args.runs):
+        output, elapsed = timed_analyze()
+        print(f"  run {run + 1}: {elapsed:.3f}s")
+
+        # 결과 순서(analysis/recommendation)가 바뀌지 않았는지 확인
+        assert output == {'analysis': 'analysis', 'recommendation': 'recommendation'}, output
+        assert elapsed < limit, f"동시 실행되지 않음: {elapsed:.3f}s"
+
+    assert client.max_in_flight == 2
+    print("[OK] 두 요청이 동시에 실행됨 (max(a, b)에 가까움)")
+
+    # 여러 세션이 같은 분석기를 동시에 사용 → 다른 세션의 요청 뒤에서 기다리지 않아야 함
+    client.max_in_flight = 0
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        timings = list(pool.map(timed_analyze, range(args.sessions)))
+    slowest = max(elapsed for _, elapsed in timings)
+    print(f"  {args.sessions}개 세션 동시 호출: 가장 느린 세션 {slowest:.3f}s")
+
+    assert all(output == {'analysis': 'analysis', 'recommendation': 'recommendation'} for output, _ in timings)
+    assert slowest < limit, f"세션 간 대기 발생: {slowest:.3f}s"
+    assert client.max_in_flight == 2 * args.sessions
+    print(f"[OK] {args.sessions}개 세션이 서로 기다리지 않고 동시에 실행됨")
+
+
+if __name__ == "__main__":
+    main()
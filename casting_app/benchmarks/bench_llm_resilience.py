@@ -0,0 +1,140 @@
+"""
+AsyncClaudeClient 재시도 / 서킷 브레이커 검증
+
+로컬 가짜 Messages API 서버(fake_llm_server.py)로
+1. 여러 라인에서 동시에 분석을 요청하고 처음 몇 건은 429로 실패시켜
+   재시도로 모든 리포트가 LLM 결과로 완성되는지
+2. 서버가 계속 실패(529)하면 서킷 브레이커가 열리고,
+   이후 요청은 서버에 보내지 않고 규칙 기반 권장 조치로 대체되는지
+3. half_open 시험 요청이 재시도 가능한 오류(529)로 실패하거나 도중에 취소되어도
+   브레이커가 half_open에 멈추지 않고 다시 open → 다음 시험 요청으로 복구되는지
+를 확인 (실제 API 키/네트워크 불필요)
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/bench_llm_resilience.py
+    python benchmarks/bench_llm_resilience.py --stations 16 --fail-requests 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from fake_llm_server import FakeAnthropicServer
+from llm.analyzer import DefectAnalyzer
+from llm.async_client import AsyncClaudeClient
+
+RESULT = {'prediction': 1, 'confidence': 0.97, 'class_name': config.CLASS_NAMES[1]}
+
+
+def run_stations(analyzer, stations):
+    """라인 stations곳에서 동시에 analyze() 호출"""
+    with ThreadPoolExecutor(max_workers=stations) as pool:
+        return list(pool.map(lambda _: analyzer.analyze(RESULT), range(stations)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=8)
+    parser.add_argument("--fail-requests", type=int, default=3)
+    args = parser.parse_args()
+
+    # 캐시를 거치면 서버에 요청이 가지 않으므로 끄고, 검증이 빨리 끝나도록 백오프를 줄임
+    config.LLM_CACHE_ENABLED = False
+    config.LLM_RETRY_BASE_DELAY = 0.05
+    config.LLM_RETRY_MAX_DELAY = 0.5
+
+    # 1. 일시적인 429 → 재시도로 복구
+    with FakeAnthropicServer(first_token_delay=0.05, token_delay=0.0, fail_requests=args.fail_requests) as server:
+        client = AsyncClaudeClient(api_key='test', base_url=server.base_url)
+        analyzer = DefectAnalyzer(llm_client=client, mode='single')
+        fallback = analyzer.get_simple_recommendation(RESULT['prediction'], RESULT['confidence'])
+        outputs = run_stations(analyzer, args.stations)
+        metrics = client.get_metrics()
+        client.close()
+
+    print(f"[429 x {args.fail_requests}] {metrics}")
+    assert all(o['recommendation'] != fallback for o in outputs), "재시도 후에도 대체 결과가 사용됨"
+    assert metrics['rate_limited'] == args.fail_requests and metrics['retries'] >= args.fail_requests
+    assert metrics['breaker_state'] == 'closed'
+
+    # 2. 계속 실패 → 서킷 브레이커 open, 규칙 기반 대체
+    config.LLM_MAX_RETRIES = 1
+    config.LLM_BREAKER_FAILURE_THRESHOLD = 3
+    with FakeAnthropicServer(first_token_delay=0.0, fail_requests=10 ** 6, fail_status=529) as server:
+        client = AsyncClaudeClient(api_key='test', base_url=server.base_url)
+        analyzer = DefectAnalyzer(llm_client=client, mode='single')
+        outputs = [analyzer.analyze(RESULT) for _ in range(args.stations)]
+        metrics = client.get_metrics()
+        server_requests = server.requests
+        client.close()
+
+    print(f"[529 계속] {metrics} / 서버 요청 {server_requests}건")
+    assert all(o['recommendation'] == fallback for o in outputs)
+    assert metrics['breaker_state'] == 'open' and metrics['short_circuited'] > 0
+    # 브레이커가 열린 뒤에는 서버로 요청이 가지 않아야 함
+    assert server_requests == config.LLM_BREAKER_FAILURE_THRESHOLD * (config.LLM_MAX_RETRIES + 1)
+
+    # 3. half_open 시험 요청이 실패/취소되어도 브레이커가 멈추지 않음
+    config.LLM_BREAKER_RESET_TIMEOUT = 0.3
+    opening = config.LLM_BREAKER_FAILURE_THRESHOLD * (config.LLM_MAX_RETRIES + 1)
+    reset_wait = config.LLM_BREAKER_RESET_TIMEOUT + 0.05
+
+    # 3-1. 시험 요청이 529로 실패 → 재시도 없이 다시 open, 다음 시험 요청은 성공
+    with FakeAnthropicServer(first_token_delay=0.0, fail_requests=opening + 1, fail_status=529) as server:
+        client = AsyncClaudeClient(api_key='test', base_url=server.base_url)
+        analyzer = DefectAnalyzer(llm_client=client, mode='single')
+        for _ in range(config.LLM_BREAKER_FAILURE_THRESHOLD):
+            analyzer.analyze(RESULT)
+        assert client.breaker.state == 'open'
+
+        time.sleep(reset_wait)
+        probe = analyzer.analyze(RESULT)
+        probe_state, probe_requests = client.breaker.state, server.requests
+
+        time.sleep(reset_wait)
+        recovered = analyzer.analyze(RESULT)
+        metrics = client.get_metrics()
+        client.close()
+
+    print(f"[시험 요청 실패] 실패 직후 {probe_state} / 복구 후 {metrics['breaker_state']}")
+    assert probe['recommendation'] == fallback
+    assert probe_state == 'open' and probe_requests == opening + 1, "시험 요청이 재시도되었거나 half_open에 멈춤"
+    assert recovered['recommendation'] != fallback and metrics['breaker_state'] == 'closed'
+
+    # 3-2. 스트리밍 시험 요청이 첫 조각 전에 취소 → 다시 open, 다음 시험 요청은 성공
+    with FakeAnthropicServer(first_token_delay=1.0, token_delay=0.0, fail_requests=opening, fail_status=529) as server:
+        client = AsyncClaudeClient(api_key='test', base_url=server.base_url)
+        analyzer = DefectAnalyzer(llm_client=client, mode='single')
+        for _ in range(config.LLM_BREAKER_FAILURE_THRESHOLD):
+            analyzer.analyze(RESULT)
+        time.sleep(reset_wait)
+
+        async def consume():
+            async for _ in client.agenerate_stream('ping'):
+                pass
+
+        trial = asyncio.run_coroutine_threadsafe(consume(), client._loop)
+        time.sleep(0.2)
+        trial.cancel()
+        time.sleep(0.1)
+        cancel_state = client.breaker.state
+
+        time.sleep(reset_wait)
+        recovered = analyzer.analyze(RESULT)
+        metrics = client.get_metrics()
+        client.close()
+
+    print(f"[시험 요청 취소] 취소 직후 {cancel_state} / 복구 후 {metrics['breaker_state']}")
+    assert cancel_state == 'open', "취소된 시험 요청 후 브레이커가 half_open에 멈춤"
+    assert recovered['recommendation'] != fallback and metrics['breaker_state'] == 'closed'
+
+    print("[OK] 재시도로 429를 복구하고, 장애 시 서킷 브레이커가 규칙 기반 결과로 대체하며, 시험 요청 실패/취소 후에도 복구됨")
+
+
+if __name__ == "__main__":
+    main()
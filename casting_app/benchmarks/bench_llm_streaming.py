@@ -0,0 +1,68 @@
+"""
+ClaudeClient.generate_stream() 첫 토큰 시간(TTFT) 검증
+
+로컬 가짜 Messages API 서버(fake_llm_server.py)에 연결하여
+- generate(): 전체 응답을 받을 때까지의 시간
+- generate_stream(): 첫 조각까지의 시간 / 전체 시간
+- DefectAnalyzer.analyze_stream(): 마지막 결과가 analyze()와 같은지
+를 확인 (실제 API 키/네트워크 불필요)
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/bench_llm_streaming.py
+    python benchmarks/bench_llm_streaming.py --first-token-delay 0.3 --token-delay 0.02
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from fake_llm_server import FakeAnthropicServer
+from llm.analyzer import DefectAnalyzer
+from llm.client import ClaudeClient
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--first-token-delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    # 캐시를 거치면 두 번째 요청부터 서버에 가지 않으므로 끔
+    config.LLM_CACHE_ENABLED = False
+
+    with FakeAnthropicServer(first_token_delay=args.first_token_delay, token_delay=args.token_delay) as server:
+        client = ClaudeClient(api_key='test', base_url=server.base_url)
+
+        start = time.perf_counter()
+        full = client.generate("prompt")
+        blocking = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chunks, first = [], None
+        for text in client.generate_stream("prompt"):
+            if first is None:
+                first = time.perf_counter() - start
+            chunks.append(text)
+        streaming = time.perf_counter() - start
+
+        print(f"generate()        : 전체 {blocking:.3f}s")
+        print(f"generate_stream() : 첫 조각 {first:.3f}s / 전체 {streaming:.3f}s ({len(chunks)}개 조각)")
+        assert ''.join(chunks) == full, "스트리밍 결과를 이어 붙인 값이 generate() 결과와 다름"
+        assert first < blocking / 2, "첫 조각이 전체 응답보다 충분히 빨리 도착하지 않음"
+
+        analyzer = DefectAnalyzer(llm_client=client, mode='single')
+        result = {'prediction': 1, 'confidence': 0.97, 'class_name': config.CLASS_NAMES[1]}
+        snapshots = list(analyzer.analyze_stream(result))
+        final = analyzer.analyze(result)
+        print(f"analyze_stream()  : 중간 결과 {len(snapshots) - 1}회")
+        assert snapshots[-1] == final, "analyze_stream()의 마지막 결과가 analyze()와 다름"
+        assert all('===' not in s['analysis'] for s in snapshots), "구분자가 화면용 결과에 노출됨"
+
+    print("[OK] 스트리밍 응답이 첫 토큰 시점부터 전달됨")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+load_image() 전체 해상도 디코딩 vs draft 축소 디코딩 벤치마크
+
+assets/ 샘플과 합성 대형 프레임(기본 4000x3000)에 대해 디코딩 시간과
+디코딩된 픽셀 버퍼 크기(= 이미지당 최대 메모리 사용량의 대부분)를 비교
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/bench_load_image.py --repeats 20 --frame-size 4000 3000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from PIL import Image
+
+import config
+from utils.imaging import load_image
+
+
+def make_synthetic_frame(path, width, height):
+    """카메라 프레임을 흉내 낸 대형 JPEG 생성 (그라데이션 + 노이즈)"""
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    frame = np.broadcast_to(gradient, (height, width, 3)) + rng.normal(0, 12, (height, width, 3))
+    Image.fromarray(np.clip(frame, 0, 255).astype(np.uint8)).save(path, quality=90)
+
+
+def measure(paths, repeats, max_size):
+    """
+    Returns:
+        tuple: (이미지당 평균 디코딩 시간 ms, 이미지당 평균 디코딩 버퍼 MB, 디코딩 크기 예시)
+    """
+    elapsed = 0.0
+    buffer_bytes = 0
+    size = None
+    for _ in range(repeats):
+        for path in paths:
+            start = time.perf_counter()
+            image = load_image(path, max_size=max_size)
+            elapsed += time.perf_counter() - start
+            buffer_bytes += image.width * image.height * len(image.getbands())
+            size = image.size
+    n = repeats * len(paths)
+    return elapsed / n * 1000, buffer_bytes / n / 1024 / 1024, size
+
+
+def report(title, paths, repeats):
+    target = (config.IMAGE_SIZE[1], config.IMAGE_SIZE[0])
+    full_ms, full_mb, full_size = measure(paths, repeats, None)
+    draft_ms, draft_mb, draft_size = measure(paths, repeats, target)
+    print(f"[{title}] 이미지 {len(paths)}장 x {repeats}회")
+    print(f"  전체 해상도 : {full_ms:7.2f} ms, {full_mb:7.2f} MB/장, 디코딩 크기 {full_size}")
+    print(f"  draft 디코딩: {draft_ms:7.2f} ms, {draft_mb:7.2f} MB/장, 디코딩 크기 {draft_size}")
+    print(f"  속도 향상   : {full_ms / draft_ms:.2f}x, 메모리 {full_mb / draft_mb:.1f}x 감소")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--frame-size", type=int, nargs=2, default=(4000, 3000), metavar=('W', 'H'))
+    args = parser.parse_args()
+
+    samples = sorted((config.BASE_DIR / "assets").glob("sample_*.jpeg"))
+    report("assets 샘플", samples, args.repeats)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        frame_path = Path(tmp) / "synthetic_frame.jpg"
+        make_synthetic_frame(frame_path, *args.frame_size)
+        report(f"합성 프레임 {args.frame_size[0]}x{args.frame_size[1]}", [frame_path], max(1, args.repeats // 4))
+
+
+if __name__ == "__main__":
+    main()
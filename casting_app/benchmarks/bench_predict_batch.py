@@ -0,0 +1,58 @@
+"""
+단건 predict() vs predict_batch() 처리량 벤치마크
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/bench_predict_batch.py --num-images 64 --batch-size 16
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from classifiers.image_classifier import ImageClassifier
+from utils.imaging import load_image
+
+
+def load_sample_images(num_images):
+    """assets/의 샘플 이미지를 num_images 개가 될 때까지 반복해서 로드"""
+    paths = sorted((config.BASE_DIR / "assets").glob("sample_*.jpeg"))
+    if not paths:
+        raise FileNotFoundError("assets/ 폴더에 샘플 이미지가 없습니다")
+    base = [load_image(p) for p in paths]
+    return [base[i % len(base)] for i in range(num_images)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-images", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=config.BATCH_SIZE)
+    args = parser.parse_args()
+
+    model_path = config.MODEL_PATH if config.MODEL_PATH.exists() else None
+    classifier = ImageClassifier(model_path)
+    images = load_sample_images(args.num_images)
+
+    # 워밍업
+    classifier.predict(images[0])
+    classifier.predict_batch(images[:args.batch_size], batch_size=args.batch_size)
+
+    start = time.perf_counter()
+    for image in images:
+        classifier.predict(image)
+    single_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    classifier.predict_batch(images, batch_size=args.batch_size)
+    batch_sec = time.perf_counter() - start
+
+    print(f"디바이스: {classifier.device} / 이미지 수: {len(images)}")
+    print(f"predict()       : {len(images) / single_sec:8.1f} images/sec")
+    print(f"predict_batch({args.batch_size:>2}): {len(images) / batch_sec:8.1f} images/sec")
+    print(f"속도 향상       : {single_sec / batch_sec:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
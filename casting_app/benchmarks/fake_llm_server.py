@@ -0,0 +1,223 @@
+"""
+로컬 가짜 Anthropic Messages API 서버 (LLM 벤치마크/검증용)
+
+POST /v1/messages 요청에 정해진 응답 텍스트를 돌려줌
+- "stream": true 이면 Messages API와 같은 SSE 이벤트로 토큰 단위 전송
+- 아니면 전체 메시지를 JSON으로 한 번에 전송
+첫 토큰 지연(first_token_delay)과 토큰 간 지연(token_delay)을 지정할 수 있고,
+처음 fail_requests건은 fail_status(기본 429, Retry-After 포함)로 실패시킬 수 있음
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/fake_llm_server.py --port 8765
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=test streamlit run app.py
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_RESPONSE = """===ANALYSIS===
+### 1. 판정 요약
+- 주조 제품 표면에서 결함이 감지되었습니다 (신뢰도 높음).
+
+### 2. 신뢰도 분석
+AI 판단이 매우 확실함. 추가 검증 불필요.
+
+### 3. 예상 원인 분석
+- 금형 온도 편차로 인한 수축 결함
+- 주입 압력 부족
+- 냉각 속도 불균일
+
+### 4. 권장 조치 사항
+즉시 격리 후 재작업/폐기 결정, 공정 변수 점검.
+
+### 5. 추가 검토 사항
+- 결함 주변부 두께 측정
+===RECOMMENDATION===
+### 작업자 조치 (3가지 이내)
+- 해당 제품 격리
+- 동일 LOT 표시
+- 공정 담당자 보고
+
+### QC 담당자 확인사항 (2가지)
+- 금형 온도 기록 확인
+- 동일 LOT 샘플링 검사
+"""
+
+
+def _tokens(text):
+    """응답을 토큰 비슷한 조각(단어 + 뒤따르는 공백)으로 나눔"""
+    return re.findall(r'\S+\s*|\s+', text)
+
+
+class FakeAnthropicServer:
+    """백그라운드 스레드에서 실행되는 가짜 Messages API 서버"""
+
+    def __init__(self, response_text=DEFAULT_RESPONSE, first_token_delay=0.5, token_delay=0.01,
+                 fail_requests=0, fail_status=429, retry_after=0.1, host='127.0.0.1', port=0):
+        """
+        Args:
+            response_text: 모든 요청에 돌려줄 응답
+            first_token_delay: 요청을 받은 뒤 첫 토큰까지의 지연 (초)
+            token_delay: 토큰 사이 지연 (초)
+            fail_requests: 처음 이 건수만큼 fail_status로 응답 (재시도/서킷 브레이커 검증용)
+            fail_status: 실패 응답 상태 코드 (예: 429, 529)
+            retry_after: 실패 응답의 Retry-After 헤더 (초)
+            host, port: 바인딩 주소 (port=0이면 빈 포트 자동 선택)
+        """
+        self.response_text = response_text
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.fail_requests = fail_requests
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='FakeAnthropicServer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                if not self.path.startswith('/v1/messages'):
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                with server._lock:
+                    server.requests += 1
+                    fail = server.failed < server.fail_requests
+                    if fail:
+                        server.failed += 1
+                if fail:
+                    self._fail()
+                    return
+                time.sleep(server.first_token_delay)
+                try:
+                    if body.get('stream'):
+                        self._stream(body)
+                    else:
+                        self._complete(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 요청을 취소하고 연결을 끊은 경우
+                    self.close_connection = True
+
+            def _fail(self):
+                payload = json.dumps({
+                    'type': 'error',
+                    'error': {'type': 'rate_limit_error', 'message': 'fake server: injected failure'}
+                }).encode('utf-8')
+                self.send_response(server.fail_status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('Retry-After', str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _message(self, body, text, output_tokens):
+                return {
+                    'id': f"msg_fake_{server.requests}",
+                    'type': 'message',
+                    'role': 'assistant',
+                    'model': body.get('model', 'fake'),
+                    'content': [{'type': 'text', 'text': text}] if text is not None else [],
+                    'stop_reason': 'end_turn' if text is not None else None,
+                    'stop_sequence': None,
+                    'usage': {'input_tokens': 100, 'output_tokens': output_tokens}
+                }
+
+            def _complete(self, body):
+                tokens = _tokens(server.response_text)
+                time.sleep(server.token_delay * len(tokens))
+                payload = json.dumps(self._message(body, server.response_text, len(tokens))).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, body):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+
+                tokens = _tokens(server.response_text)
+                self._event('message_start', {'type': 'message_start', 'message': self._message(body, None, 1)})
+                self._event('content_block_start', {
+                    'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}
+                })
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(server.token_delay)
+                    self._event('content_block_delta', {
+                        'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': token}
+                    })
+                self._event('content_block_stop', {'type': 'content_block_stop', 'index': 0})
+                self._event('message_delta', {
+                    'type': 'message_delta',
+                    'delta': {'stop_reason': 'end_turn', 'stop_sequence': None},
+                    'usage': {'output_tokens': len(tokens)}
+                })
+                self._event('message_stop', {'type': 'message_stop'})
+                self.close_connection = True
+
+            def _event(self, name, data):
+                self.wfile.write(f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token-delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--fail-requests", type=int, default=0)
+    parser.add_argument("--fail-status", type=int, default=429)
+    args = parser.parse_args()
+
+    server = FakeAnthropicServer(first_token_delay=args.first_token_delay, token_delay=args.token_delay,
+                                 fail_requests=args.fail_requests, fail_status=args.fail_status,
+                                 port=args.port).start()
+    print(f"[OK] 가짜 Messages API 서버 실행 중: {server.base_url} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+다중 프로세스 동시 이력 기록 스트레스 테스트
+
+N개 프로세스가 같은 이력 파일에 동시에 add_record()를 호출하고
+(그동안 다른 프로세스들은 이력을 새로 열고 조회를 반복)
+- 기록된 행 수가 정확히 (프로세스 수 x 프로세스당 건수)인지
+- 모든 (프로세스, 순번) 쌍이 한 번씩만 존재하는지 (손실/중복/행 섞임 없음)
+- 통계 롤업 합계가 원본 행 수와 일치하는지
+- 기록/조회 프로세스가 모두 오류 없이 끝났는지
+를 확인 (하나라도 어긋나면 종료 코드 1)
+
+사용법 (casting_app 폴더에서):
+    python benchmarks/stress_history_writers.py --backend csv --workers 16 --records 500
+    python benchmarks/stress_history_writers.py --backend parquet --workers 16 --records 200 --readers 4
+"""
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from services.history import InspectionHistory
+
+
+def writer(history_file, backend, worker_id, records, start_event):
+    history = InspectionHistory(history_file, backend=backend)
+    start_event.wait()
+    for seq in range(records):
+        prediction = seq % 2
+        history.add_record({
+            'inspection_time': datetime.now(),
+            'prediction': prediction,
+            'class_name': config.CLASS_NAMES[prediction],
+            'confidence': 0.9,
+            # 어떤 프로세스의 몇 번째 기록인지 확률 컬럼에 담아 검증에 사용
+            'probabilities': {config.CLASS_NAMES[0]: float(worker_id), config.CLASS_NAMES[1]: float(seq)}
+        })
+    if hasattr(history.backend, 'flush'):
+        history.backend.flush()
+    history.rollups.save()
+
+
+def reader(history_file, backend, start_event, stop_event):
+    """기록 중인 이력을 새로 열고 조회 (대시보드/다른 워커의 시작을 흉내)"""
+    start_event.wait()
+    while not stop_event.is_set():
+        history = InspectionHistory(history_file, backend=backend)
+        history.get_history(days=1)
+        history.get_recent_records(limit=10)
+        history.get_statistics(days=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=['csv', 'sqlite', 'parquet'], default='csv')
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--records", type=int, default=500, help="프로세스당 기록 건수")
+    parser.add_argument("--readers", type=int, default=2, help="기록 중에 이력을 열고 조회하는 프로세스 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_file = str(Path(tmp) / config.HISTORY_PATHS[args.backend])
+        InspectionHistory(history_file, backend=args.backend)
+
+        ctx = mp.get_context('spawn')
+        start_event, stop_event = ctx.Event(), ctx.Event()
+        processes = [
+            ctx.Process(target=writer, args=(history_file, args.backend, i, args.records, start_event))
+            for i in range(args.workers)
+        ]
+        readers = [
+            ctx.Process(target=reader, args=(history_file, args.backend, start_event, stop_event))
+            for _ in range(args.readers)
+        ]
+        for p in processes + readers:
+            p.start()
+        time.sleep(1.0)  # 모든 프로세스가 준비될 때까지 대기
+        started = time.perf_counter()
+        start_event.set()
+        for p in processes:
+            p.join()
+        elapsed = time.perf_counter() - started
+        stop_event.set()
+        for p in readers:
+            p.join()
+
+        failed = [p.exitcode for p in processes + readers if p.exitcode != 0]
+        history = InspectionHistory(history_file, backend=args.backend)
+        df = history.get_history(days=1)
+        expected = args.workers * args.records
+        pairs = set(zip(df['normal_prob'].astype(int), df['defect_prob'].astype(int)))
+        missing = expected - len(pairs)
+        duplicates = len(df) - len(pairs)
+        rollup_total = history.get_statistics(days=1)['total']
+
+        print(f"backend={args.backend} workers={args.workers} records/worker={args.records} ({elapsed:.2f}s)")
+        print(f"  기록된 행    : {len(df):,} / 기대값 {expected:,}")
+        print(f"  손실 / 중복  : {missing} / {duplicates}")
+        print(f"  롤업 합계    : {rollup_total:,}")
+        print(f"  실패 프로세스: {len(failed)}")
+
+        ok = not failed and len(df) == expected and missing == 0 and duplicates == 0 and rollup_total == expected
+        print("[OK] 손실 없음" if ok else "[FAIL] 기록 불일치")
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+추론 런타임 프로파일 자동 튜닝
+
+현재 호스트에서 스레드 수 / channels_last / inference_mode / torch.compile 조합을
+벤치마크하고, 가장 빠른 조합을 config.RUNTIME_PROFILE_PATH에 기록
+(config.py가 시작 시 이 파일을 읽어 RUNTIME_PROFILE에 반영)
+
+사용법 (casting_app 폴더에서):
+    python classifiers/autotune.py --workers 2
+    python classifiers/autotune.py --workers 4 --try-compile --batch-size 8
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from classifiers.image_classifier import ImageClassifier
+from utils.imaging import load_image
+
+
+def thread_candidates(workers):
+    """워커 수를 고려한 워커당 스레드 수 후보 (1, 2, 4, ... 코어/워커)"""
+    max_threads = max(1, (os.cpu_count() or 1) // workers)
+    candidates = []
+    n = 1
+    while n < max_threads:
+        candidates.append(n)
+        n *= 2
+    candidates.append(max_threads)
+    return candidates
+
+
+def benchmark(profile, images, batch_size, model_path, repeats=3):
+    """
+    프로파일 하나에 대한 처리량 측정
+
+    Returns:
+        float: images/sec (repeats 중 최고값)
+    """
+    classifier = ImageClassifier(model_path, profile=profile)
+
+    # 워밍업 (torch.compile은 첫 호출에서 컴파일)
+    classifier.predict_batch(images[:batch_size], batch_size=batch_size)
+    classifier.predict(images[0])
+
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if batch_size > 1:
+            classifier.predict_batch(images, batch_size=batch_size)
+        else:
+            for image in images:
+                classifier.predict(image)
+        best = max(best, len(images) / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=1, help="이 호스트에서 동시에 실행할 워커 수")
+    parser.add_argument("--batch-size", type=int, default=1, help="측정할 배치 크기 (1이면 단건 predict)")
+    parser.add_argument("--num-images", type=int, default=32)
+    parser.add_argument("--try-compile", action="store_true", help="torch.compile 조합도 측정")
+    parser.add_argument("--output", default=str(config.RUNTIME_PROFILE_PATH))
+    args = parser.parse_args()
+
+    model_path = config.MODEL_PATH if config.MODEL_PATH.exists() else None
+    samples = [load_image(p) for p in sorted((config.BASE_DIR / "assets").glob("sample_*.jpeg"))]
+    images = [samples[i % len(samples)] for i in range(args.num_images)]
+
+    compile_options = [False, True] if args.try_compile else [False]
+    results = []
+    for threads, channels_last, inference_mode, compile_model in itertools.product(
+        thread_candidates(args.workers), [False, True], [False, True], compile_options
+    ):
+        profile = {
+            'intra_op_threads': threads,
+            'inter_op_threads': 1,
+            'channels_last': channels_last,
+            'inference_mode': inference_mode,
+            'compile': compile_model
+        }
+        try:
+            throughput = benchmark(profile, images, args.batch_size, model_path)
+        except Exception as e:
+            print(f"[WARNING] 측정 실패 {profile}: {e}")
+            continue
+        results.append((throughput, profile))
+        print(f"{throughput:8.1f} images/sec  {profile}")
+
+    if not results:
+        raise RuntimeError("측정에 성공한 프로파일이 없습니다")
+
+    best_throughput, best_profile = max(results, key=lambda r: r[0])
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(best_profile, f, indent=2)
+    print(f"[OK] 최적 프로파일 ({best_throughput:.1f} images/sec) 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+추론 backend용 모델 내보내기 (TorchScript / ONNX)
+
+사용법 (casting_app 폴더에서):
+    python classifiers/export.py --format all
+    python classifiers/export.py --format onnx --tolerance 1e-4
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch
+import config
+from classifiers.image_classifier import ImageClassifier
+from utils.imaging import load_image
+
+
+def _example_input(classifier):
+    return torch.zeros(1, 3, *config.IMAGE_SIZE, device=classifier.device)
+
+
+def export_torchscript(classifier, output_path=None):
+    """
+    eager 모델을 TorchScript로 trace하여 저장
+
+    Args:
+        classifier: eager backend ImageClassifier
+        output_path: 저장 경로 (기본값: config.TORCHSCRIPT_PATH)
+
+    Returns:
+        Path: 저장된 파일 경로
+    """
+    output_path = Path(output_path or config.TORCHSCRIPT_PATH)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        traced = torch.jit.trace(classifier.model, _example_input(classifier))
+        traced = torch.jit.freeze(traced)
+    traced.save(str(output_path))
+    return output_path
+
+
+def export_onnx(classifier, output_path=None, opset=17):
+    """
+    eager 모델을 ONNX로 저장 (배치 차원은 동적)
+
+    Args:
+        classifier: eager backend ImageClassifier
+        output_path: 저장 경로 (기본값: config.ONNX_PATH)
+        opset: ONNX opset 버전
+
+    Returns:
+        Path: 저장된 파일 경로
+    """
+    output_path = Path(output_path or config.ONNX_PATH)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    torch.onnx.export(
+        classifier.model,
+        _example_input(classifier),
+        str(output_path),
+        input_names=['input'],
+        output_names=['logits'],
+        dynamic_axes={'input': {0: 'batch'}, 'logits': {0: 'batch'}},
+        opset_version=opset
+    )
+    return output_path
+
+
+def check_parity(reference, candidate, images, tolerance=1e-4):
+    """
+    두 ImageClassifier의 클래스 확률이 허용 오차 안에서 일치하는지 확인
+
+    Args:
+        reference: 기준 ImageClassifier (eager)
+        candidate: 비교할 ImageClassifier (torchscript / onnxruntime)
+        images: PIL Image 리스트
+        tolerance: 허용되는 최대 확률 차이
+
+    Returns:
+        float: 관측된 최대 확률 차이
+
+    Raises:
+        AssertionError: 허용 오차를 넘는 경우
+    """
+    ref_results = reference.predict_batch(images)
+    cand_results = candidate.predict_batch(images)
+
+    max_diff = 0.0
+    for ref, cand in zip(ref_results, cand_results):
+        for name in config.CLASS_NAMES:
+            max_diff = max(max_diff, abs(ref['probabilities'][name] - cand['probabilities'][name]))
+
+    if max_diff > tolerance:
+        raise AssertionError(
+            f"{candidate.backend} 확률 불일치: 최대 차이 {max_diff:.2e} > 허용 오차 {tolerance:.0e}"
+        )
+    return max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=['torchscript', 'onnx', 'all'], default='all')
+    parser.add_argument("--model-path", default=str(config.MODEL_PATH))
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="확률 일치 허용 오차")
+    args = parser.parse_args()
+
+    classifier = ImageClassifier(args.model_path, backend='eager')
+    images = [load_image(p) for p in sorted((config.BASE_DIR / "assets").glob("sample_*.jpeg"))]
+
+    targets = []
+    if args.format in ('torchscript', 'all'):
+        print(f"[OK] TorchScript 저장: {export_torchscript(classifier)}")
+        targets.append('torchscript')
+    if args.format in ('onnx', 'all'):
+        print(f"[OK] ONNX 저장: {export_onnx(classifier)}")
+        targets.append('onnxruntime')
+
+    for backend in targets:
+        candidate = ImageClassifier(args.model_path, backend=backend)
+        max_diff = check_parity(classifier, candidate, images, args.tolerance)
+        print(f"[OK] {backend} 확률 일치 확인 (최대 차이 {max_diff:.2e}, 이미지 {len(images)}장)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,61 @@ import torch
 import torch.nn as nn
 from torchvision import models
 import config
-from utils.imaging import get_inference_transform
+import numpy as np
+from utils.preprocessing import prepare_array, array_to_tensor
+from classifiers.inspection_result import InspectionResult
+
+BACKENDS = ('eager', 'torchscript', 'onnxruntime', 'quantized')
 
 class ImageClassifier:
-    def __init__(self, model_path=None):
-        self.device = torch.device(config.DEVICE if torch.cuda.is_available() else 'cpu')
-        self.model = self._build_model()
-        if model_path:
-            self.model.load_state_dict(torch.load(model_path, map_location=self.device))
-        self.transform = get_inference_transform()
+    def __init__(self, model_path=None, backend=None, profile=None):
+        self.model_path = model_path
+        self.profile = {**config.RUNTIME_PROFILE, **(profile or {})}
+        self._apply_thread_settings()
+        self.backend = backend or config.INFERENCE_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"알 수 없는 INFERENCE_BACKEND: {self.backend}")
+
+        if self.backend == 'quantized':
+            # INT8 양자화 모델은 CPU에서만 실행
+            self.device = torch.device('cpu')
+        elif config.DEVICE == 'cuda' and not torch.cuda.is_available():
+            print("[WARNING] CUDA를 사용할 수 없어 CPU로 추론합니다.")
+            self.device = torch.device('cpu')
+        else:
+            self.device = torch.device(config.DEVICE)
+
+        self._model = None
+        self._runner = self._load_runner()
+
+    def _apply_thread_settings(self):
+        """워커당 intra/inter-op 스레드 수 설정 (여러 워커가 코어를 과점유하지 않도록)"""
+        if self.profile['intra_op_threads'] > 0:
+            torch.set_num_threads(self.profile['intra_op_threads'])
+        if self.profile['inter_op_threads'] > 0:
+            try:
+                torch.set_num_interop_threads(self.profile['inter_op_threads'])
+            except RuntimeError:
+                # 병렬 작업이 이미 시작된 뒤에는 변경할 수 없음 (프로세스당 1회)
+                pass
+
+    def _inference_context(self):
+        """RUNTIME_PROFILE에 따라 inference_mode 또는 no_grad 컨텍스트 반환"""
+        return torch.inference_mode() if self.profile['inference_mode'] else torch.no_grad()
+
+    @property
+    def model(self):
+        """
+        eager PyTorch 모델 (Grad-CAM 등 그래디언트가 필요한 경우에 사용)
+        eager 이외의 backend에서는 처음 접근할 때 로드
+        """
+        if self._model is None:
+            self._model = self._build_model()
+            if self.model_path:
+                self._model.load_state_dict(torch.load(self.model_path, map_location=self.device))
+            if self.profile['channels_last']:
+                self._model = self._model.to(memory_format=torch.channels_last)
+        return self._model
 
     def _build_model(self):
         """EfficientNet-B0 모델 생성"""
@@ -25,19 +71,122 @@ class ImageClassifier:
         )
         return model.to(self.device).eval()
 
+    def _load_runner(self):
+        """INFERENCE_BACKEND에 맞는 추론 실행기 로드"""
+        if self.backend == 'torchscript':
+            return torch.jit.load(str(config.TORCHSCRIPT_PATH), map_location=self.device).eval()
+        if self.backend == 'quantized':
+            return torch.jit.load(str(config.QUANTIZED_MODEL_PATH), map_location='cpu').eval()
+        if self.backend == 'onnxruntime':
+            try:
+                import onnxruntime as ort
+            except ImportError:
+                raise ImportError("onnxruntime backend를 사용하려면 'pip install onnxruntime'이 필요합니다")
+            options = ort.SessionOptions()
+            if self.profile['intra_op_threads'] > 0:
+                options.intra_op_num_threads = self.profile['intra_op_threads']
+            if self.profile['inter_op_threads'] > 0:
+                options.inter_op_num_threads = self.profile['inter_op_threads']
+            return ort.InferenceSession(str(config.ONNX_PATH), options, providers=['CPUExecutionProvider'])
+        if self.profile['compile']:
+            return torch.compile(self.model)
+        return self.model
+
+    def _forward(self, batch):
+        """선택된 backend로 forward 수행 → logits 텐서 (N, num_classes)"""
+        if self.backend == 'onnxruntime':
+            input_name = self._runner.get_inputs()[0].name
+            logits = self._runner.run(None, {input_name: batch.cpu().numpy()})[0]
+            return torch.from_numpy(logits)
+        if self.profile['channels_last']:
+            batch = batch.contiguous(memory_format=torch.channels_last)
+        return self._runner(batch)
+
+    def _build_result(self, probs, input_tensor):
+        """소프트맥스 확률 한 행(numpy 배열)을 InspectionResult로 변환"""
+        pred = int(probs.argmax())
+        return InspectionResult(pred, probs[pred], probs, input_tensor)
+
+    def head(self, features):
+        """eager 모델의 특징 맵(features 출력) → logits (pooling + classifier)"""
+        return self.model.classifier(torch.flatten(self.model.avgpool(features), 1))
+
+    def preprocess(self, image):
+        """PIL Image 또는 prepare_array() 배열 → 모델 입력 텐서 (1, C, H, W)"""
+        return array_to_tensor(prepare_array(image), self.device)
+
     def predict(self, image):
-        input_tensor = self.transform(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            outputs = self.model(input_tensor)
-            probs = torch.softmax(outputs, dim=1)[0]
-            pred = torch.argmax(probs).item()
-        return {
-            'prediction': pred,
-            'confidence': probs[pred].item(),
-            'class_name': config.CLASS_NAMES[pred],
-            'probabilities': {
-                config.CLASS_NAMES[0]: probs[0].item(),  # 정상 확률
-                config.CLASS_NAMES[1]: probs[1].item()   # 불량 확률
-            },
-            'input_tensor': input_tensor
-        }
+        input_tensor = self.preprocess(image)
+        with self._inference_context():
+            outputs = self._forward(input_tensor)
+            probs = torch.softmax(outputs, dim=1)[0].cpu().numpy()
+        return self._build_result(probs, input_tensor)
+
+    def predict_with_features(self, image):
+        """
+        predict()와 같지만 eager 모델의 특징 맵(Grad-CAM target layer 출력)도 함께 반환
+
+        예측 후 Grad-CAM이 필요하다고 판단되면 GradCAMGenerator.generate_map_from_features()로
+        head만 다시 계산하여 히트맵을 구함 (backbone forward를 다시 하지 않음)
+
+        Args:
+            image: PIL Image 또는 prepare_array() 배열
+
+        Returns:
+            tuple: (InspectionResult, 특징 맵 텐서 (1, C, h, w))
+        """
+        input_tensor = self.preprocess(image)
+        batch = input_tensor
+        if self.profile['channels_last']:
+            batch = batch.contiguous(memory_format=torch.channels_last)
+        with self._inference_context():
+            features = self.model.features(batch)
+            probs = torch.softmax(self.head(features), dim=1)[0].cpu().numpy()
+        # inference_mode에서 만든 텐서는 역전파에 사용할 수 없으므로 컨텍스트 밖에서 복사
+        return self._build_result(probs, input_tensor), features.clone()
+
+    def predict_batch(self, images, batch_size=config.BATCH_SIZE):
+        """
+        여러 이미지를 묶어서 예측 (batch_size 단위로 한 번씩 forward)
+
+        Args:
+            images: PIL Image 또는 prepare_array() 배열 리스트
+            batch_size: 한 번의 forward에 넣을 최대 이미지 수
+
+        Returns:
+            list: 이미지별 predict() 결과 InspectionResult (입력 순서 유지)
+                input_tensor는 배치 텐서의 view이므로, 결과를 오래 보관할 때는
+                release_tensors()로 해제해야 배치 텐서 메모리가 반환됨
+        """
+        results = []
+        for start in range(0, len(images), batch_size):
+            chunk = images[start:start + batch_size]
+            batch = array_to_tensor(np.stack([prepare_array(image) for image in chunk]), self.device)
+            with self._inference_context():
+                outputs = self._forward(batch)
+                probs = torch.softmax(outputs, dim=1).cpu().numpy()
+            for i in range(len(chunk)):
+                # 단건 predict()와 동일하게 (1, C, H, W) 형태의 텐서를 유지
+                results.append(self._build_result(probs[i], batch[i:i + 1]))
+        return results
+
+    def predict_with_cam(self, image, explainer):
+        """
+        예측과 Grad-CAM을 한 번의 forward로 수행 (eager 모델 사용)
+
+        Args:
+            image: PIL Image 또는 prepare_array() 배열
+            explainer: generate_with_logits()를 제공하는 GradCAMGenerator
+
+        Returns:
+            InspectionResult: predict() 결과 + cam_image, cam_map
+        """
+        # 리사이즈된 배열 하나를 모델 입력과 히트맵 오버레이에 함께 사용
+        image_array = prepare_array(image)
+        input_tensor = array_to_tensor(image_array, self.device)
+        logits, cam_image, cam_map = explainer.generate_with_logits(input_tensor, image_array, return_map=True)
+        probs = torch.softmax(logits.detach(), dim=1)[0].cpu().numpy()
+        result = self._build_result(probs, input_tensor)
+        result.cam_image = cam_image
+        result.cam_map = cam_map
+        return result
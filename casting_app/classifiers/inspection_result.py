@@ -0,0 +1,108 @@
+"""
+InspectionResult - 검사 결과 레코드
+"""
+import numpy as np
+import config
+
+
+class InspectionResult:
+    """
+    예측/Grad-CAM/검사 시각을 담는 결과 레코드 (__slots__로 인스턴스 dict 없음)
+
+    확률은 CLASS_NAMES 순서의 float32 배열로 보관하고, 기존 코드(app/PDF/LLM)를 위해
+    result['probabilities'] 같은 dict 방식 접근도 그대로 지원.
+    무거운 값(input_tensor, cam_image)은 필요 없어지면 release_*()로 바로 해제 가능.
+    cam_map은 오버레이 전의 uint8 히트맵 (결과 페이로드 보관용)
+    """
+
+    __slots__ = ('prediction', 'confidence', 'probs', 'input_tensor', 'cam_image', 'cam_map',
+                 'inspection_time', 'image_hash')
+
+    # dict 방식으로 읽기/쓰기가 가능한 키 (class_name/probabilities는 읽기 전용 파생값)
+    _KEYS = ('prediction', 'confidence', 'class_name', 'probabilities', 'input_tensor',
+             'cam_image', 'cam_map', 'inspection_time', 'image_hash')
+    _READ_ONLY = ('class_name', 'probabilities')
+
+    def __init__(self, prediction, confidence, probs, input_tensor=None):
+        """
+        Args:
+            prediction: 예측 클래스 인덱스
+            confidence: 예측 클래스의 확률
+            probs: 클래스별 확률 (CLASS_NAMES 순서)
+            input_tensor: 전처리된 입력 텐서 (Grad-CAM 계산에 필요)
+        """
+        self.prediction = int(prediction)
+        self.confidence = float(confidence)
+        self.probs = np.asarray(probs, dtype=np.float32)
+        self.input_tensor = input_tensor
+
+    @classmethod
+    def from_record(cls, record):
+        """검사 이력 레코드(dict 또는 Series)로 결과 복원 (텐서/이미지 없음)"""
+        result = cls(record['prediction'], record['confidence'],
+                     [record['normal_prob'], record['defect_prob']])
+        image_hash = record.get('image_hash')
+        if isinstance(image_hash, str) and image_hash:
+            # CSV 이력에서 빈 값은 NaN으로 읽힘
+            result.image_hash = image_hash
+        return result
+
+    @property
+    def class_name(self):
+        return config.CLASS_NAMES[self.prediction]
+
+    @property
+    def probabilities(self):
+        """{클래스 이름: 확률} (접근할 때마다 새로 생성)"""
+        return {name: float(p) for name, p in zip(config.CLASS_NAMES, self.probs)}
+
+    @property
+    def normal_prob(self):
+        return float(self.probs[0])
+
+    @property
+    def defect_prob(self):
+        return float(self.probs[1])
+
+    def release_tensors(self):
+        """입력 텐서 참조 해제 (Grad-CAM 계산이 끝났거나 필요 없을 때)"""
+        self.input_tensor = None
+
+    def release_cam(self):
+        """Grad-CAM 이미지/히트맵 참조 해제 (화면 표시/보고서 생성 후)"""
+        if hasattr(self, 'cam_image'):
+            del self.cam_image
+        if hasattr(self, 'cam_map'):
+            del self.cam_map
+
+    # --- 기존 dict 결과와의 호환 ---
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            # 아직 설정되지 않은 값 (예: run_inspection 이전의 cam_image)
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS or key in self._READ_ONLY:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._KEYS and hasattr(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [key for key in self._KEYS if hasattr(self, key)]
+
+    def __repr__(self):
+        return (f"InspectionResult(prediction={self.prediction}, class_name={self.class_name!r}, "
+                f"confidence={self.confidence:.4f})")
@@ -0,0 +1,182 @@
+"""
+CPU용 INT8 양자화 (정적 / 동적)
+
+사용법 (casting_app 폴더에서):
+    python classifiers/quantize.py                        # assets/ 샘플로 정적 양자화
+    python classifiers/quantize.py --calib-dir data/test  # 사용자 폴더로 보정
+    python classifiers/quantize.py --mode dynamic         # Linear 레이어만 동적 양자화
+
+양자화 모델은 TorchScript로 config.QUANTIZED_MODEL_PATH에 저장되며,
+INFERENCE_BACKEND='quantized'로 사용할 수 있음
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import torch
+import torch.nn as nn
+from torch.ao.quantization import get_default_qconfig_mapping, quantize_dynamic
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+import config
+from classifiers.image_classifier import ImageClassifier
+from utils.imaging import load_image
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def collect_images(folder):
+    """폴더(하위 폴더 포함)의 이미지 경로 목록"""
+    return sorted(p for p in Path(folder).rglob('*') if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def label_from_path(path):
+    """
+    파일/폴더 이름으로 정답 레이블 추정 (cast_def_* / def_front → 1, cast_ok_* / ok_front → 0)
+
+    Returns:
+        int or None: 추정할 수 없으면 None
+    """
+    name = '/'.join(Path(path).parts[-2:]).lower()
+    if 'def' in name:
+        return 1
+    if 'ok' in name or 'normal' in name:
+        return 0
+    return None
+
+
+def quantize_static(classifier, calibration_images, engine='x86'):
+    """
+    FX 그래프 모드 정적 양자화 (conv/linear 가중치와 활성값을 INT8로)
+
+    Args:
+        classifier: FP32 eager ImageClassifier
+        calibration_images: 활성값 범위 보정용 PIL Image 리스트
+        engine: 양자화 엔진 ('x86', 'fbgemm', 'qnnpack')
+
+    Returns:
+        torch.nn.Module: 양자화된 모델 (CPU)
+    """
+    torch.backends.quantized.engine = engine
+    model = copy.deepcopy(classifier.model).cpu().eval()
+    example = torch.zeros(1, 3, *config.IMAGE_SIZE)
+
+    prepared = prepare_fx(model, get_default_qconfig_mapping(engine), example_inputs=(example,))
+    with torch.no_grad():
+        for image in calibration_images:
+            prepared(classifier.preprocess(image).cpu())
+    return convert_fx(prepared)
+
+
+def quantize_dynamic_linear(classifier):
+    """Linear 레이어만 동적 INT8 양자화 (보정 불필요, 효과는 제한적)"""
+    model = copy.deepcopy(classifier.model).cpu().eval()
+    return quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def save_quantized(model, output_path=None):
+    """양자화 모델을 TorchScript로 저장"""
+    output_path = Path(output_path or config.QUANTIZED_MODEL_PATH)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    example = torch.zeros(1, 3, *config.IMAGE_SIZE)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    traced.save(str(output_path))
+    return output_path
+
+
+def accuracy_delta_report(fp32, int8, paths):
+    """
+    FP32 대비 INT8 모델의 정확도/일치율/지연시간 비교
+
+    Args:
+        fp32: FP32 ImageClassifier
+        int8: 양자화 ImageClassifier
+        paths: 평가 이미지 경로 리스트
+
+    Returns:
+        dict: 비교 결과
+    """
+    report = {'num_images': len(paths), 'agreement': 0, 'max_prob_diff': 0.0,
+              'fp32_correct': 0, 'int8_correct': 0, 'labeled': 0,
+              'fp32_ms': 0.0, 'int8_ms': 0.0}
+
+    for path in paths:
+        image = load_image(path)
+
+        start = time.perf_counter()
+        ref = fp32.predict(image)
+        report['fp32_ms'] += (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        cand = int8.predict(image)
+        report['int8_ms'] += (time.perf_counter() - start) * 1000
+
+        report['agreement'] += int(ref['prediction'] == cand['prediction'])
+        report['max_prob_diff'] = max(
+            report['max_prob_diff'],
+            abs(ref['probabilities'][config.CLASS_NAMES[1]] - cand['probabilities'][config.CLASS_NAMES[1]])
+        )
+
+        label = label_from_path(path)
+        if label is not None:
+            report['labeled'] += 1
+            report['fp32_correct'] += int(ref['prediction'] == label)
+            report['int8_correct'] += int(cand['prediction'] == label)
+
+    n = max(len(paths), 1)
+    report['agreement_rate'] = report['agreement'] / n * 100
+    report['fp32_ms'] /= n
+    report['int8_ms'] /= n
+    if report['labeled']:
+        report['fp32_accuracy'] = report['fp32_correct'] / report['labeled'] * 100
+        report['int8_accuracy'] = report['int8_correct'] / report['labeled'] * 100
+        report['accuracy_delta'] = report['int8_accuracy'] - report['fp32_accuracy']
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=['static', 'dynamic'], default='static')
+    parser.add_argument("--model-path", default=str(config.MODEL_PATH))
+    parser.add_argument("--calib-dir", default=str(config.BASE_DIR / "assets"), help="보정용 이미지 폴더")
+    parser.add_argument("--eval-dir", default=None, help="정확도 비교용 이미지 폴더 (기본값: 보정 폴더)")
+    parser.add_argument("--engine", default='x86', choices=['x86', 'fbgemm', 'qnnpack'])
+    args = parser.parse_args()
+
+    fp32 = ImageClassifier(args.model_path, backend='eager')
+    calib_paths = collect_images(args.calib_dir)
+    if args.mode == 'static' and not calib_paths:
+        raise FileNotFoundError(f"보정용 이미지가 없습니다: {args.calib_dir}")
+
+    if args.mode == 'static':
+        model = quantize_static(fp32, [load_image(p) for p in calib_paths], engine=args.engine)
+    else:
+        model = quantize_dynamic_linear(fp32)
+    output_path = save_quantized(model)
+    print(f"[OK] 양자화 모델 저장: {output_path} ({args.mode}, 보정 이미지 {len(calib_paths)}장)")
+
+    int8 = ImageClassifier(args.model_path, backend='quantized')
+    eval_paths = collect_images(args.eval_dir) if args.eval_dir else calib_paths
+    report = accuracy_delta_report(fp32, int8, eval_paths)
+
+    fp32_size = os.path.getsize(args.model_path) / 1024 / 1024 if Path(args.model_path).exists() else 0.0
+    int8_size = os.path.getsize(output_path) / 1024 / 1024
+
+    print(f"평가 이미지     : {report['num_images']}장")
+    print(f"판정 일치율     : {report['agreement_rate']:.2f}%")
+    print(f"최대 불량확률 차: {report['max_prob_diff']:.4f}")
+    if report['labeled']:
+        print(f"정확도 FP32/INT8: {report['fp32_accuracy']:.2f}% / {report['int8_accuracy']:.2f}% "
+              f"(차이 {report['accuracy_delta']:+.2f}%p, 레이블 {report['labeled']}장)")
+    print(f"평균 지연시간   : {report['fp32_ms']:.1f} ms → {report['int8_ms']:.1f} ms "
+          f"({report['fp32_ms'] / max(report['int8_ms'], 1e-9):.2f}x)")
+    print(f"모델 크기       : {fp32_size:.1f} MB → {int8_size:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 """
 
 import os
+import json
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -19,16 +20,118 @@ MODEL_PATH = MODEL_DIR / "final_efficientnet_b0.pth"
 MODEL_NAME = "efficientnet_b0"  # 사용할 모델 아키텍처
 CLASS_NAMES = ['정상 (OK)', '불량 (Defective)']
 
+# 추론 backend 설정 ('eager', 'torchscript', 'onnxruntime', 'quantized')
+# torchscript/onnxruntime은 classifiers/export.py, quantized(INT8, CPU 전용)는
+# classifiers/quantize.py로 먼저 모델을 내보내야 함
+INFERENCE_BACKEND = os.getenv('INFERENCE_BACKEND', 'eager')
+TORCHSCRIPT_PATH = MODEL_DIR / "final_efficientnet_b0.torchscript.pt"
+ONNX_PATH = MODEL_DIR / "final_efficientnet_b0.onnx"
+QUANTIZED_MODEL_PATH = MODEL_DIR / "final_efficientnet_b0.int8.pt"
+
 # 디바이스 설정
 DEVICE = "cuda"  # 또는 "cpu"
 
+# 추론 런타임 프로파일 (classifiers/autotune.py가 RUNTIME_PROFILE_PATH에 최적값을 기록)
+# - intra_op_threads / inter_op_threads: 워커당 스레드 수 (0이면 PyTorch 기본값)
+# - channels_last: NHWC 메모리 포맷 사용
+# - inference_mode: no_grad 대신 torch.inference_mode 사용
+# - compile: torch.compile 사용 (eager backend 전용)
+RUNTIME_PROFILE_PATH = BASE_DIR / "runtime_profile.json"
+RUNTIME_PROFILE = {
+    'intra_op_threads': int(os.getenv('INTRA_OP_THREADS', '0')),
+    'inter_op_threads': int(os.getenv('INTER_OP_THREADS', '0')),
+    'channels_last': False,
+    'inference_mode': True,
+    'compile': False
+}
+if RUNTIME_PROFILE_PATH.exists():
+    with open(RUNTIME_PROFILE_PATH, encoding='utf-8') as f:
+        RUNTIME_PROFILE.update(json.load(f))
+
 # 이미지 설정
 IMAGE_SIZE = (224, 224)
 NORMALIZE_MEAN = [0.485, 0.456, 0.406]
 NORMALIZE_STD = [0.229, 0.224, 0.225]
 
+# 배치 추론 설정
+BATCH_SIZE = 16  # predict_batch()의 기본 배치 크기
+
+# 마이크로 배치 스케줄러 설정 (동시 요청을 모아 한 번에 추론)
+USE_BATCH_SCHEDULER = os.getenv('USE_BATCH_SCHEDULER', 'false').lower() == 'true'
+SCHEDULER_MAX_BATCH_SIZE = 16
+SCHEDULER_MAX_WAIT_MS = 10
+
+# Grad-CAM 생성 정책
+# - 'always': 모든 검사에서 생성
+# - 'defects_only': 불량 판정일 때만 생성
+# - 'low_confidence': 신뢰도가 EXPLAIN_CONFIDENCE_THRESHOLD 미만일 때만 생성
+# - 'on_demand': UI/PDF에서 접근할 때 생성
+# 즉시 생성하지 않은 경우 결과에는 LazyCamImage 핸들이 담김
+EXPLAIN_POLICY = os.getenv('EXPLAIN_POLICY', 'always')
+EXPLAIN_CONFIDENCE_THRESHOLD = 0.95
+
+# 검사 이력 저장소 설정 ('csv', 'sqlite' 또는 'parquet')
+# 기존 CSV 이력은 services/migrate_history.py로 SQLite로 옮길 수 있음
+HISTORY_BACKEND = os.getenv('HISTORY_BACKEND', 'csv')
+HISTORY_PATHS = {
+    'csv': 'inspection_history.csv',
+    'sqlite': 'inspection_history.db',
+    'parquet': 'inspection_history_parquet'  # 날짜별 파티션 디렉터리
+}
+HISTORY_PARQUET_FLUSH_ROWS = 500  # 버퍼에 이만큼 쌓이면 기록
+HISTORY_PARQUET_FLUSH_INTERVAL = 60  # 또는 마지막 기록 후 이 시간(초)이 지나면 기록
+HISTORY_PARQUET_COMPACT_PARTS = 32  # 날짜 파티션의 part 파일이 이만큼 쌓이면 하나로 합침
+HISTORY_ROLLUP_SAVE_INTERVAL = 5  # 통계 롤업 파일 저장 최소 간격 (초)
+HISTORY_ROLLUP_HOUR_RETENTION_DAYS = 31  # 시간 단위 롤업 보관 기간 (이후는 일 단위만)
+HISTORY_RETENTION_DAYS = int(os.getenv('HISTORY_RETENTION_DAYS', '0'))  # 핫 계층 보관 기간 (일, 기본 0 = 정리 안 함)
+HISTORY_COMPACTION_INTERVAL = 3600  # 보관 기간 정리 주기 (초, 이 간격으로 백그라운드 실행)
+
+# 검사 결과 페이로드 저장소 (썸네일 / Grad-CAM / LLM 분석, 이미지 해시로 이력과 연결)
+BLOB_STORE_ENABLED = os.getenv('BLOB_STORE_ENABLED', 'false').lower() == 'true'
+BLOB_STORE_DIR = 'inspection_blobs'
+BLOB_STORE_MAX_BYTES = 2 * 1024 ** 3  # 초과 시 오래 사용하지 않은 항목부터 삭제
+BLOB_THUMBNAIL_SIZE = (256, 256)
+
+# 검사 이력 비동기 기록 (검사 결과 반환 후 백그라운드에서 배치로 기록)
+HISTORY_ASYNC_WRITES = os.getenv('HISTORY_ASYNC_WRITES', 'false').lower() == 'true'
+HISTORY_WRITER_MAX_QUEUE = 10000
+HISTORY_WRITER_BATCH_SIZE = 200  # 이만큼 모이면 기록
+HISTORY_WRITER_FLUSH_INTERVAL_MS = 500  # 또는 이 시간이 지나면 기록
+HISTORY_WRITER_FULL_POLICY = 'block'  # 큐가 가득 찼을 때: 'block' | 'drop' | 'spill'
+
 # LLM 설정
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY', '')
+ANTHROPIC_BASE_URL = os.getenv('ANTHROPIC_BASE_URL', '')  # 프록시/로컬 테스트 서버 사용 시
 CLAUDE_MODEL = 'claude-sonnet-4-5'
 LLM_TEMPERATURE = 0.7
 LLM_MAX_TOKENS = 2048
+# 분석 방식: 'single' (상세 분석+권장 조치를 한 번의 요청으로) | 'separate' (두 요청을 동시에)
+LLM_ANALYSIS_MODE = os.getenv('LLM_ANALYSIS_MODE', 'single')
+LLM_COMBINED_MAX_TOKENS = 3072  # 단일 요청은 두 응답을 합친 길이이므로 한도를 늘림
+LLM_STREAMING = os.getenv('LLM_STREAMING', 'true').lower() == 'true'  # 리포트를 생성되는 대로 표시
+
+# LLM 클라이언트: 'sync' (요청마다 동기 호출) | 'async' (공유 연결 풀 + 속도 제한 + 재시도 + 서킷 브레이커)
+LLM_CLIENT_MODE = os.getenv('LLM_CLIENT_MODE', 'sync')
+LLM_MAX_CONNECTIONS = 10  # 공유 HTTP 연결 풀 크기
+LLM_REQUEST_TIMEOUT = 60.0  # 요청 타임아웃 (초)
+LLM_REQUESTS_PER_MINUTE = int(os.getenv('LLM_REQUESTS_PER_MINUTE', '50'))
+LLM_TOKENS_PER_MINUTE = int(os.getenv('LLM_TOKENS_PER_MINUTE', '40000'))  # 입력+출력 (요청 전 최대치로 예약 후 정산)
+LLM_MAX_RETRIES = 4  # 429/5xx/연결 오류 재시도 횟수
+LLM_RETRY_BASE_DELAY = 1.0  # 지수 백오프 시작 값 (초, full jitter)
+LLM_RETRY_MAX_DELAY = 30.0
+LLM_BREAKER_FAILURE_THRESHOLD = 5  # 연속 실패 횟수가 이만큼이면 차단
+LLM_BREAKER_RESET_TIMEOUT = 60  # 차단 후 다시 시도하기까지 (초)
+
+# LLM 응답 캐시 (같은 판정/비슷한 신뢰도의 분석 재사용)
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_PATH = 'llm_response_cache.db'
+LLM_CACHE_TTL = 7 * 24 * 3600  # 응답 유효 시간 (초, 0이면 만료 없음)
+LLM_CACHE_MAX_ENTRIES = 1000  # 초과 시 오래 사용되지 않은 응답부터 삭제
+# 캐시 키 계산 시 신뢰도를 이 단위로 내림 (0이면 구간화하지 않음, 프롬프트에는 실제 신뢰도 사용)
+LLM_CACHE_CONFIDENCE_BUCKET = float(os.getenv('LLM_CACHE_CONFIDENCE_BUCKET', '0.01'))
+# 0.05의 약수여야 구간이 신뢰도 기준(60/80/95%)을 넘지 않음
+if LLM_CACHE_CONFIDENCE_BUCKET and not (
+    0 < LLM_CACHE_CONFIDENCE_BUCKET <= 0.05
+    and abs(0.05 / LLM_CACHE_CONFIDENCE_BUCKET - round(0.05 / LLM_CACHE_CONFIDENCE_BUCKET)) < 1e-6
+):
+    raise ValueError(f"LLM_CACHE_CONFIDENCE_BUCKET은 0 또는 0.05의 약수여야 합니다: {LLM_CACHE_CONFIDENCE_BUCKET}")
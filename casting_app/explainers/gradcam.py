@@ -4,24 +4,30 @@ GradCAM 시각화 클래스
 """
 
 import torch
+import torch.nn.functional as F
 import numpy as np
-from pytorch_grad_cam import GradCAM
-from pytorch_grad_cam.utils.image import show_cam_on_image
+import cv2
 import config
+from utils.preprocessing import prepare_array
 
 
 class GradCAMGenerator:
-    """GradCAM 생성기 클래스"""
+    """
+    GradCAM 생성기 클래스
     
-    def __init__(self, model, target_layer):
+    backbone(입력 → target layer 출력)과 head(target layer 출력 → logits)를 나누어 계산하고
+    예측 클래스 점수를 특징 맵으로 직접 미분 (모델에 hook을 걸지 않으므로
+    여러 세션이 같은 모델로 동시에 호출해도 서로의 활성값이 섞이지 않음)
+    """
+    
+    def __init__(self, backbone, head):
         """
         Args:
-            model: PyTorch 모델
-            target_layer: GradCAM을 적용할 레이어
+            backbone: 입력 텐서 → target layer 출력(특징 맵) 모듈 (예: EfficientNet의 model.features)
+            head: 특징 맵 → logits 함수 (예: ImageClassifier.head)
         """
-        self.model = model
-        self.target_layer = target_layer
-        self.cam = GradCAM(model=model, target_layers=[target_layer])
+        self.backbone = backbone
+        self.head = head
     
     def generate(self, input_tensor, original_image):
         """
@@ -29,18 +35,233 @@ class GradCAMGenerator:
         
         Args:
             input_tensor: 전처리된 입력 텐서
-            original_image: 원본 이미지 (PIL Image)
+            original_image: 원본 이미지 (PIL Image 또는 prepare_array() 배열)
             
         Returns:
             numpy.ndarray: GradCAM 히트맵이 적용된 이미지
         """
-        # GradCAM 생성
-        grayscale_cam = self.cam(input_tensor=input_tensor)[0, :]
+        return self.generate_with_logits(input_tensor, original_image)[1]
+    
+    def generate_map(self, input_tensor):
+        """
+        오버레이 없이 GradCAM 히트맵만 생성 (보관 후 overlay_cam_map()으로 다시 채색)
+        
+        Args:
+            input_tensor: 전처리된 입력 텐서
+            
+        Returns:
+            numpy.ndarray: (H, W) uint8 히트맵 (0~255)
+        """
+        return np.uint8(255 * self._forward_cam(input_tensor)[1])[0]
+    
+    def generate_map_from_features(self, features, size):
+        """
+        예측 때 보관한 target layer 출력(특징 맵)으로 GradCAM 히트맵 생성
+        
+        head만 다시 계산하여 예측 클래스 점수를 특징 맵으로 미분하므로 backbone forward를 다시 하지 않음
+        
+        Args:
+            features: target layer 출력 텐서 (1, C, h, w)
+            size: 히트맵 크기 (H, W) - 모델 입력 크기
+            
+        Returns:
+            numpy.ndarray: (H, W) uint8 히트맵 (0~255)
+        """
+        return np.uint8(255 * self._cam_from_features(features, size)[1])[0]
+    
+    def generate_with_logits(self, input_tensor, original_image, return_map=False):
+        """
+        예측 logits와 GradCAM 히트맵을 한 번의 forward로 함께 생성
+        
+        Args:
+            input_tensor: 전처리된 입력 텐서 (1, C, H, W)
+            original_image: 원본 이미지 (PIL Image 또는 prepare_array() 배열)
+            return_map: True이면 (H, W) uint8 히트맵도 함께 반환
+            
+        Returns:
+            tuple: (logits 텐서 (1, num_classes), GradCAM 히트맵이 적용된 이미지[, uint8 히트맵])
+        """
+        logits, grayscale_cams = self._forward_cam(input_tensor)
+        cam_maps = np.uint8(255 * grayscale_cams)
+        cam_image = self._overlay_batch([original_image], cam_maps)[0]
+        if return_map:
+            return logits, cam_image, cam_maps[0]
+        return logits, cam_image
+    
+    def generate_batch(self, input_tensors, images, batch_size=config.BATCH_SIZE):
+        """
+        여러 이미지의 GradCAM 히트맵을 배치 단위로 생성
+        
+        Args:
+            input_tensors: 전처리된 입력 텐서 리스트 (각 (1, C, H, W)) 또는 (N, C, H, W) 텐서
+            images: 원본 이미지 (PIL Image 또는 prepare_array() 배열) 리스트
+            batch_size: 한 번의 forward/backward에 넣을 최대 이미지 수
+            
+        Returns:
+            list: 이미지별 GradCAM 히트맵이 적용된 이미지 (numpy.ndarray, uint8)
+        """
+        if isinstance(input_tensors, (list, tuple)):
+            input_tensors = torch.cat(list(input_tensors), dim=0)
         
-        # 원본 이미지를 numpy 배열로 변환
-        img_array = np.array(original_image.resize(config.IMAGE_SIZE)) / 255.0
+        cam_images = []
+        for start in range(0, len(images), batch_size):
+            _, grayscale_cams = self._forward_cam(input_tensors[start:start + batch_size])
+            cam_images.extend(self._overlay_batch(images[start:start + batch_size], grayscale_cams))
+        return cam_images
+    
+    def _forward_cam(self, input_tensor):
+        """
+        배치 forward 1회로 logits와 GradCAM 계산
         
-        # 히트맵 적용
-        cam_image = show_cam_on_image(img_array, grayscale_cam, use_rgb=True)
+        특징 맵으로의 기울기는 head에만 의존하므로 backbone은 기울기 없이 계산하고
+        head만 다시 그래프를 만들어 역전파 (backbone 쪽 활성값을 보관하지 않음)
         
-        return cam_image
+        Returns:
+            tuple: (logits 텐서 (N, num_classes), (N, H, W) float32 히트맵)
+        """
+        with torch.no_grad():
+            features = self.backbone(input_tensor)
+        return self._cam_from_features(features, input_tensor.shape[-2:])
+    
+    def _cam_from_features(self, features, size):
+        """
+        특징 맵 → head forward + 특징 맵까지의 역전파 → (logits, (N, H, W) float32 히트맵)
+        """
+        with torch.enable_grad():
+            features = features.detach().requires_grad_(True)
+            logits = self.head(features)
+            # 샘플별 점수는 서로 독립이므로 합을 미분해도 샘플별 기울기와 동일
+            score = logits.gather(1, logits.argmax(dim=1, keepdim=True)).sum()
+            grads = torch.autograd.grad(score, features)[0]
+        return logits.detach(), self._compute_cam(features.detach(), grads, tuple(size))
+    
+    @staticmethod
+    def _compute_cam(activations, grads, size):
+        """
+        GradCAM 가중합 → ReLU → 입력 크기로 업샘플 → 샘플별 0~1 정규화
+        
+        Returns:
+            numpy.ndarray: (N, H, W) float32 히트맵
+        """
+        weights = grads.mean(dim=(2, 3), keepdim=True)
+        cam = torch.relu((weights * activations).sum(dim=1, keepdim=True))
+        cam = F.interpolate(cam, size=tuple(size), mode='bilinear', align_corners=False)[:, 0]
+        
+        flat = cam.flatten(1)
+        cam_min = flat.min(dim=1).values.view(-1, 1, 1)
+        cam = cam - cam_min
+        cam_max = cam.flatten(1).max(dim=1).values.view(-1, 1, 1)
+        cam = cam / (cam_max + 1e-7)
+        return cam.cpu().numpy().astype(np.float32)
+    
+    @staticmethod
+    def _overlay_batch(images, grayscale_cams, image_weight=0.5):
+        """
+        pytorch_grad_cam의 show_cam_on_image()와 같은 결과를 배치 전체에 대해 NumPy로 한 번에 계산
+        
+        Args:
+            images: 원본 이미지 (PIL Image 또는 prepare_array() 배열) 리스트
+            grayscale_cams: (N, H, W) 0~1 float 히트맵 또는 0~255 uint8 히트맵
+            image_weight: 원본 이미지 가중치
+            
+        Returns:
+            numpy.ndarray: (N, H, W, 3) uint8 오버레이 이미지
+        """
+        img_array = _stack_images(images) / 255.0
+        
+        if grayscale_cams.dtype != np.uint8:
+            grayscale_cams = np.uint8(255 * grayscale_cams)
+        heatmap = _JET_LUT[grayscale_cams]
+        cam = (1 - image_weight) * heatmap + image_weight * img_array
+        cam = cam / cam.reshape(len(cam), -1).max(axis=1).reshape(-1, 1, 1, 1)
+        return np.uint8(255 * cam)
+
+
+def _stack_images(images):
+    """
+    원본 이미지들을 IMAGE_SIZE의 (N, H, W, 3) float32 배열(0~255)로 쌓음
+    
+    prepare_array() 배열은 그대로 쓰고, PIL 이미지는 크기가 같은 것끼리 묶어 F.interpolate
+    한 번으로 리사이즈 (prepare_array()와 같은 antialias bilinear, uint8로 반올림)
+    """
+    height, width = config.IMAGE_SIZE
+    stacked = np.empty((len(images), height, width, 3), dtype=np.float32)
+    groups = {}
+    for i, image in enumerate(images):
+        if isinstance(image, np.ndarray):
+            stacked[i] = prepare_array(image)
+        else:
+            array = np.asarray(image.convert('RGB'))
+            groups.setdefault(array.shape, []).append((i, array))
+    
+    for members in groups.values():
+        indices = [i for i, _ in members]
+        batch = torch.from_numpy(np.stack([array for _, array in members])).permute(0, 3, 1, 2).float()
+        resized = F.interpolate(batch, size=(height, width), mode='bilinear', align_corners=False, antialias=True)
+        stacked[indices] = resized.round_().clamp_(0, 255).permute(0, 2, 3, 1).numpy()
+    return stacked
+
+
+def _build_jet_lut():
+    """OpenCV COLORMAP_JET 256단계 RGB 룩업 테이블 (0~1 float32)"""
+    lut = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(256, 1), cv2.COLORMAP_JET)
+    return lut[:, 0, ::-1].astype(np.float32) / 255.0
+
+
+_JET_LUT = _build_jet_lut()
+
+
+def overlay_cam_map(original_image, cam_map):
+    """
+    보관된 uint8 히트맵을 원본(또는 썸네일) 이미지 위에 다시 채색
+    
+    Args:
+        original_image: 원본 이미지 (PIL Image 또는 prepare_array() 배열)
+        cam_map: generate_map()이 반환한 (H, W) uint8 히트맵
+        
+    Returns:
+        numpy.ndarray: GradCAM 히트맵이 적용된 이미지 (uint8)
+    """
+    return GradCAMGenerator._overlay_batch([original_image], np.asarray(cam_map, dtype=np.uint8)[None])[0]
+
+
+class LazyCamImage:
+    """필요할 때 처음 접근하는 시점에 GradCAM을 계산하는 지연 핸들"""
+    
+    def __init__(self, generate_fn, input_tensor, original_image):
+        """
+        Args:
+            generate_fn: (input_tensor, original_image)를 받아 히트맵 이미지를 반환하는 함수
+                (예: GradCAMGenerator.generate)
+            input_tensor: generate_fn에 넘길 입력 (전처리된 입력 텐서 또는 보관한 특징 맵)
+            original_image: 원본 이미지 (PIL Image 또는 prepare_array() 배열)
+        """
+        self._generate_fn = generate_fn
+        self._input_tensor = input_tensor
+        self._original_image = original_image
+        self._cam_image = None
+    
+    @property
+    def is_ready(self):
+        """이미 계산되었는지 여부"""
+        return self._cam_image is not None
+    
+    def get(self):
+        """
+        GradCAM 히트맵 이미지 반환 (최초 1회만 계산)
+        
+        Returns:
+            numpy.ndarray: GradCAM 히트맵이 적용된 이미지
+        """
+        if self._cam_image is None:
+            self._cam_image = self._generate_fn(self._input_tensor, self._original_image)
+            # 계산 후에는 입력 참조를 해제
+            self._generate_fn = self._input_tensor = self._original_image = None
+        return self._cam_image
+
+
+def resolve_cam_image(cam_image):
+    """LazyCamImage이면 계산하여 실제 이미지를, 아니면 그대로 반환"""
+    if isinstance(cam_image, LazyCamImage):
+        return cam_image.get()
+    return cam_image
@@ -3,20 +3,55 @@
 AI 예측 결과를 LLM으로 분석
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from .cache import CachedClient, ResponseCache, bucket_confidence
 from .client import ClaudeClient
+from .parser import split_combined_response, split_partial_response
 from .prompt import PromptBuilder
+from .resilience import LLMUnavailableError
+
+ANALYSIS_MODES = ('single', 'separate')
+CLIENT_MODES = ('sync', 'async')
+
+
+def create_client():
+    """
+    config.LLM_CLIENT_MODE에 맞는 LLM 클라이언트 생성
+    
+    - 'sync': 요청마다 동기 호출하는 ClaudeClient
+    - 'async': 프로세스 내에서 공유하는 AsyncClaudeClient (연결 풀/속도 제한/재시도/서킷 브레이커)
+    """
+    if config.LLM_CLIENT_MODE not in CLIENT_MODES:
+        raise ValueError(f"알 수 없는 LLM_CLIENT_MODE: {config.LLM_CLIENT_MODE} (사용 가능: {', '.join(CLIENT_MODES)})")
+    if config.LLM_CLIENT_MODE == 'async':
+        from .async_client import AsyncClaudeClient
+        return AsyncClaudeClient.shared()
+    return ClaudeClient()
 
 
 class DefectAnalyzer:
     """결함 분석 클래스"""
     
-    def __init__(self, llm_client=None):
+    def __init__(self, llm_client=None, mode=None, cache=None):
         """
         Args:
-            llm_client: Claude 클라이언트 (없으면 자동 생성)
+            llm_client: Claude 클라이언트 (없으면 create_client()로 생성)
+            mode: 'single' 또는 'separate' (없으면 config.LLM_ANALYSIS_MODE)
+            cache: 응답 캐시 (없으면 config.LLM_CACHE_ENABLED일 때 ResponseCache 생성)
         """
-        self.llm_client = llm_client or ClaudeClient()
+        self.llm_client = llm_client or create_client()
+        self._base_client = self.llm_client
+        if cache is None and config.LLM_CACHE_ENABLED:
+            cache = ResponseCache()
+        self.cache = cache
+        if self.cache is not None:
+            self.llm_client = CachedClient(self.llm_client, self.cache)
         self.prompt_builder = PromptBuilder()
+        self.mode = mode or config.LLM_ANALYSIS_MODE
+        if self.mode not in ANALYSIS_MODES:
+            raise ValueError(f"알 수 없는 LLM_ANALYSIS_MODE: {self.mode} (사용 가능: {', '.join(ANALYSIS_MODES)})")
     
     def analyze(self, prediction_result):
         """
@@ -31,27 +66,147 @@ class DefectAnalyzer:
                 'recommendation': str (권장 조치)
             }
         """
+        prediction, confidence, class_name = self._prepare(prediction_result)
+        try:
+            if self.mode == 'single':
+                return self._analyze_single(prediction, confidence, class_name)
+            return self._analyze_separate(prediction, confidence, class_name)
+        except LLMUnavailableError as e:
+            return self._fallback(prediction, confidence, e)
+    
+    def analyze_stream(self, prediction_result):
+        """
+        예측 결과 분석 (스트리밍) - 응답이 생성되는 대로 중간 결과를 반환
+        
+        Args:
+            prediction_result: ImageClassifier의 predict() 결과
+            
+        Yields:
+            dict: 지금까지 받은 {'analysis', 'recommendation'} (아직 없는 부분은 빈 문자열)
+                마지막 값은 analyze()의 결과와 같은 형태
+        """
+        prediction, confidence, class_name = self._prepare(prediction_result)
+        try:
+            yield from self._analyze_stream(prediction, confidence, class_name)
+        except LLMUnavailableError as e:
+            # 도중에 실패하면 받은 내용 대신 규칙 기반 결과로 교체
+            yield self._fallback(prediction, confidence, e)
+    
+    def _analyze_stream(self, prediction, confidence, class_name):
+        if self.mode == 'single':
+            response = ''
+            for text in self._generate(self.prompt_builder.build_combined_analysis_prompt,
+                                       prediction, confidence, class_name,
+                                       max_tokens=config.LLM_COMBINED_MAX_TOKENS, stream=True):
+                response += text
+                analysis, recommendation = split_partial_response(response)
+                yield {'analysis': analysis, 'recommendation': recommendation}
+            yield self._finalize_single(response, prediction, confidence)
+            return
+        
+        # 권장 조치는 별도 스레드에서 받고, 상세 분석을 스트리밍
+        # (분석기는 여러 세션이 공유하므로 호출마다 스레드를 만들어 다른 세션 요청 뒤에서 기다리지 않도록 함)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='llm-analyzer')
+        try:
+            recommendation_future = executor.submit(
+                self._generate, self.prompt_builder.build_recommendation_prompt, prediction, confidence
+            )
+            analysis = ''
+            for text in self._generate(self.prompt_builder.build_defect_analysis_prompt,
+                                       prediction, confidence, class_name, stream=True):
+                analysis += text
+                yield {'analysis': analysis, 'recommendation': ''}
+            yield {'analysis': analysis, 'recommendation': recommendation_future.result()}
+        finally:
+            executor.shutdown(wait=False)
+    
+    def _prepare(self, prediction_result):
+        """예측 결과에서 프롬프트에 쓰는 값 추출 → (prediction, confidence, class_name)"""
         prediction = prediction_result['prediction']
         confidence = prediction_result['confidence']
         class_name = prediction_result['class_name']
+        return prediction, confidence, class_name
+    
+    def _generate(self, build_prompt, prediction, confidence, *args, max_tokens=None, stream=False):
+        """
+        build_prompt(prediction, confidence, *args)로 만든 프롬프트로 LLM 호출
         
-        # 상세 분석
-        analysis_prompt = self.prompt_builder.build_defect_analysis_prompt(
-            prediction, confidence, class_name
-        )
-        analysis = self.llm_client.generate(analysis_prompt)
-        
-        # 권장 조치
-        recommendation_prompt = self.prompt_builder.build_recommendation_prompt(
-            prediction, confidence
-        )
-        recommendation = self.llm_client.generate(recommendation_prompt)
+        프롬프트에는 실제 신뢰도를 쓰고, 캐시 키만 신뢰도를 구간으로 묶은 프롬프트로 만들어
+        비슷한 결과가 같은 캐시 항목을 사용하도록 함
+        """
+        prompt = build_prompt(prediction, confidence, *args)
+        kwargs = {'max_tokens': max_tokens}
+        if self.cache is not None:
+            kwargs['key_prompt'] = build_prompt(prediction, bucket_confidence(confidence), *args)
+        if stream:
+            return self.llm_client.generate_stream(prompt, **kwargs)
+        return self.llm_client.generate(prompt, **kwargs)
+    
+    def _analyze_single(self, prediction, confidence, class_name):
+        """상세 분석과 권장 조치를 한 번의 요청으로 받아 분리"""
+        response = self._generate(self.prompt_builder.build_combined_analysis_prompt,
+                                  prediction, confidence, class_name,
+                                  max_tokens=config.LLM_COMBINED_MAX_TOKENS)
+        return self._finalize_single(response, prediction, confidence)
+    
+    def _finalize_single(self, response, prediction, confidence):
+        """단일 호출 응답을 분리하고, 찾지 못한 부분은 대체값으로 채움"""
+        analysis, recommendation = split_combined_response(response)
+        if analysis is None:
+            # 형식을 따르지 않은 응답(또는 오류 메시지)은 그대로 상세 분석으로 표시
+            analysis = response
+        if recommendation is None:
+            # 권장 조치를 찾지 못하면 (응답 잘림 등) 규칙 기반 권장 조치로 대체
+            recommendation = self.get_simple_recommendation(prediction, confidence)
         
         return {
             'analysis': analysis,
             'recommendation': recommendation
         }
     
+    def _analyze_separate(self, prediction, confidence, class_name):
+        """상세 분석과 권장 조치를 각각 요청 (두 요청은 동시에 실행)"""
+        # 두 요청을 동시에 보내고 둘 다 끝날 때까지 대기 (소요 시간 ≈ 둘 중 긴 쪽)
+        # 분석기는 여러 세션이 공유하므로 호출마다 스레드를 만들어 다른 세션 요청 뒤에서 기다리지 않도록 함
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='llm-analyzer') as executor:
+            analysis_future = executor.submit(
+                self._generate, self.prompt_builder.build_defect_analysis_prompt, prediction, confidence, class_name
+            )
+            recommendation_future = executor.submit(
+                self._generate, self.prompt_builder.build_recommendation_prompt, prediction, confidence
+            )
+            
+            return {
+                'analysis': analysis_future.result(),
+                'recommendation': recommendation_future.result()
+            }
+    
+    def _fallback(self, prediction, confidence, error):
+        """LLM을 사용할 수 없을 때 (재시도 실패/서킷 브레이커 open) 규칙 기반 결과"""
+        return {
+            'analysis': f"[WARNING] AI 상세 분석을 일시적으로 사용할 수 없어 규칙 기반 판정만 제공합니다. ({error})",
+            'recommendation': self.get_simple_recommendation(prediction, confidence)
+        }
+    
+    def get_client_metrics(self):
+        """
+        LLM 클라이언트 지표 (지연 시간/재시도/서킷 브레이커 상태)
+        
+        Returns:
+            dict: 클라이언트의 get_metrics() 결과 (지표를 제공하지 않는 클라이언트면 None)
+        """
+        get_metrics = getattr(self._base_client, 'get_metrics', None)
+        return get_metrics() if get_metrics is not None else None
+    
+    def get_cache_metrics(self):
+        """
+        응답 캐시 지표
+        
+        Returns:
+            dict: ResponseCache.get_metrics() 결과 (캐시 미사용 시 None)
+        """
+        return self.cache.get_metrics() if self.cache is not None else None
+    
     def get_simple_recommendation(self, prediction, confidence):
         """
         간단한 권장 조치 (LLM 없이)
@@ -0,0 +1,331 @@
+"""
+비동기 Claude AI 클라이언트
+공유 HTTP 연결 풀 + 속도 제한 + 재시도 + 서킷 브레이커
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+
+import anthropic
+import httpx
+import numpy as np
+
+import config
+from .resilience import CircuitBreaker, LLMUnavailableError, RateLimiter, backoff_delay
+
+_shared = None
+_shared_lock = threading.Lock()
+_STREAM_END = object()
+
+
+class AsyncClaudeClient:
+    """
+    AsyncAnthropic 기반 클라이언트
+
+    전용 이벤트 루프 스레드에서 모든 요청을 처리하므로 여러 세션/스레드가 하나의 연결 풀,
+    속도 제한, 서킷 브레이커를 공유. 동기 코드에서는 ClaudeClient와 같은
+    generate()/generate_stream()을 사용하고, 비동기 코드에서는 agenerate()를 사용.
+
+    ClaudeClient와 달리 실패 시 오류 문자열 대신 LLMUnavailableError를 발생시킴
+    (호출하는 쪽에서 규칙 기반 권장 조치로 대체)
+    """
+
+    @classmethod
+    def shared(cls):
+        """프로세스 내에서 하나의 클라이언트(연결 풀/속도 제한)를 공유"""
+        global _shared
+        with _shared_lock:
+            if _shared is None:
+                _shared = cls()
+            return _shared
+
+    def __init__(self, api_key=None, base_url=None, max_connections=None, requests_per_minute=None,
+                 tokens_per_minute=None, max_retries=None, metrics_window=1000):
+        """
+        Args:
+            api_key: Anthropic API 키
+            base_url: API 주소 (없으면 config.ANTHROPIC_BASE_URL, 비어 있으면 기본 주소)
+            max_connections: 연결 풀 크기 (없으면 config.LLM_MAX_CONNECTIONS)
+            requests_per_minute: 분당 요청 수 제한 (없으면 config.LLM_REQUESTS_PER_MINUTE)
+            tokens_per_minute: 분당 토큰 수 제한 (없으면 config.LLM_TOKENS_PER_MINUTE)
+            max_retries: 재시도 가능한 오류의 최대 재시도 횟수 (없으면 config.LLM_MAX_RETRIES)
+            metrics_window: 지연 시간 지표에 사용할 최근 요청 수
+        """
+        self.api_key = api_key or config.ANTHROPIC_API_KEY
+        if not self.api_key:
+            raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다")
+
+        self.base_url = base_url or config.ANTHROPIC_BASE_URL or None
+        self.max_connections = max_connections or config.LLM_MAX_CONNECTIONS
+        self.model_name = config.CLAUDE_MODEL
+        self.temperature = config.LLM_TEMPERATURE
+        self.max_tokens = config.LLM_MAX_TOKENS
+        self.max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+
+        self.limiter = RateLimiter(
+            requests_per_minute or config.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute or config.LLM_TOKENS_PER_MINUTE
+        )
+        self.breaker = CircuitBreaker(config.LLM_BREAKER_FAILURE_THRESHOLD, config.LLM_BREAKER_RESET_TIMEOUT)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=metrics_window)
+        self._requests = 0
+        self._failures = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._short_circuited = 0
+        self._limiter_wait = 0.0
+
+        # 이벤트 루프 스레드 시작 후 그 루프 안에서 HTTP 클라이언트 생성
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='AsyncClaudeClient', daemon=True)
+        self._thread.start()
+        self._client = self._run(self._create_client())
+
+    async def _create_client(self):
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=httpx.Timeout(config.LLM_REQUEST_TIMEOUT, connect=10.0)
+        )
+        # 재시도는 직접 처리 (SDK 내부 재시도는 속도 제한/지표에 잡히지 않음)
+        return anthropic.AsyncAnthropic(api_key=self.api_key, base_url=self.base_url,
+                                        max_retries=0, http_client=http_client)
+
+    def _run(self, coro):
+        """이벤트 루프 스레드에서 코루틴을 실행하고 결과를 기다림"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    # --- 동기 인터페이스 (ClaudeClient와 동일) ---
+
+    def generate(self, prompt, max_tokens=None):
+        """
+        텍스트 생성
+
+        Raises:
+            LLMUnavailableError: 재시도 후에도 실패했거나 서킷 브레이커가 열려 있는 경우
+        """
+        return self._run(self.agenerate(prompt, max_tokens))
+
+    def generate_stream(self, prompt, max_tokens=None):
+        """
+        텍스트 생성 (스트리밍)
+
+        Raises:
+            LLMUnavailableError: 첫 조각을 받기 전에 실패한 경우 (재시도 후)
+        """
+        chunks = queue.Queue()
+
+        async def produce():
+            try:
+                async for text in self.agenerate_stream(prompt, max_tokens):
+                    chunks.put(text)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(_STREAM_END)
+
+        asyncio.run_coroutine_threadsafe(produce(), self._loop)
+        while True:
+            item = chunks.get()
+            if item is _STREAM_END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    # --- 비동기 인터페이스 ---
+
+    async def agenerate(self, prompt, max_tokens=None):
+        """텍스트 생성 (속도 제한 → 요청 → 재시도 가능한 오류면 백오프 후 재시도)"""
+        max_tokens = max_tokens or self.max_tokens
+
+        async def call():
+            message = await self._client.messages.create(
+                model=self.model_name,
+                max_tokens=max_tokens,
+                temperature=self.temperature,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            return message.content[0].text, message.usage
+
+        return await self._call_with_retries(call, prompt, max_tokens)
+
+    async def agenerate_stream(self, prompt, max_tokens=None):
+        """
+        텍스트 생성 (스트리밍)
+
+        첫 조각을 받기 전의 실패만 재시도 (이미 화면에 표시된 내용을 다시 보내지 않도록)
+        """
+        max_tokens = max_tokens or self.max_tokens
+        estimated = self._estimate_tokens(prompt, max_tokens)
+        attempt = 0
+        while True:
+            trial = await self._before_request(estimated)
+            start = time.perf_counter()
+            received = False
+            recorded = False
+            try:
+                async with self._client.messages.stream(
+                    model=self.model_name,
+                    max_tokens=max_tokens,
+                    temperature=self.temperature,
+                    messages=[{"role": "user", "content": prompt}]
+                ) as stream:
+                    async for text in stream.text_stream:
+                        received = True
+                        yield text
+                    usage = (await stream.get_final_message()).usage
+                recorded = True
+            except Exception as e:
+                self.limiter.tokens.refund(estimated)
+                recorded = True
+                # 시험 요청은 재시도하지 않음 (재시도하면 브레이커가 허용하지 않아 half_open에 머묾)
+                if trial or received or not await self._should_retry(e, attempt):
+                    self._record_failure()
+                    raise LLMUnavailableError(f"LLM 요청 실패: {e}") from e
+                attempt += 1
+                continue
+            finally:
+                if trial and not recorded:
+                    # 취소/소비 중단으로 결과 없이 끝난 시험 요청:
+                    # 응답을 받기 시작했으면 성공, 아니면 실패로 기록 (half_open에 머물지 않도록)
+                    if received:
+                        self.breaker.record_success()
+                    else:
+                        self.breaker.record_failure()
+
+            self._record_success(start, estimated, usage)
+            return
+
+    async def _call_with_retries(self, call, prompt, max_tokens):
+        estimated = self._estimate_tokens(prompt, max_tokens)
+        attempt = 0
+        while True:
+            trial = await self._before_request(estimated)
+            start = time.perf_counter()
+            recorded = False
+            try:
+                text, usage = await call()
+                recorded = True
+            except Exception as e:
+                self.limiter.tokens.refund(estimated)
+                recorded = True
+                # 시험 요청은 재시도하지 않음 (재시도하면 브레이커가 허용하지 않아 half_open에 머묾)
+                if trial or not await self._should_retry(e, attempt):
+                    self._record_failure()
+                    raise LLMUnavailableError(f"LLM 요청 실패: {e}") from e
+                attempt += 1
+                continue
+            finally:
+                if trial and not recorded:
+                    # 결과 없이 취소된 시험 요청 → 다시 open (다음 시험까지 대기)
+                    self.breaker.record_failure()
+
+            self._record_success(start, estimated, usage)
+            return text
+
+    async def _before_request(self, estimated_tokens):
+        """
+        서킷 브레이커 확인 후 속도 제한만큼 대기
+
+        Returns:
+            bool: half_open 상태의 시험 요청 여부
+        """
+        state = self.breaker.acquire()
+        if state is None:
+            with self._lock:
+                self._short_circuited += 1
+            raise LLMUnavailableError("LLM 서킷 브레이커가 열려 있습니다 (연속 실패로 일시 차단)")
+        trial = state == CircuitBreaker.HALF_OPEN
+        try:
+            waited = await self.limiter.acquire(estimated_tokens)
+        except BaseException:
+            if trial:
+                # 속도 제한 대기 중 취소된 시험 요청
+                self.breaker.record_failure()
+            raise
+        with self._lock:
+            self._requests += 1
+            self._limiter_wait += waited
+        return trial
+
+    async def _should_retry(self, error, attempt):
+        """재시도 가능한 오류이고 횟수가 남았으면 백오프만큼 대기 후 True"""
+        status = getattr(error, 'status_code', None)
+        if status == 429:
+            with self._lock:
+                self._rate_limited += 1
+        retryable = (
+            isinstance(error, anthropic.APIConnectionError)  # 연결 오류/타임아웃
+            or status == 429 or (status is not None and status >= 500)
+        )
+        if not retryable or attempt >= self.max_retries:
+            return False
+
+        retry_after = None
+        response = getattr(error, 'response', None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get('retry-after'))
+            except (TypeError, ValueError):
+                pass
+        with self._lock:
+            self._retries += 1
+        await asyncio.sleep(backoff_delay(attempt, config.LLM_RETRY_BASE_DELAY,
+                                          config.LLM_RETRY_MAX_DELAY, retry_after))
+        return True
+
+    @staticmethod
+    def _estimate_tokens(prompt, max_tokens):
+        """요청 전에 토큰 버킷에서 꺼낼 양 (한글 위주 프롬프트 기준 대략 글자 수 = 토큰 수 + 출력 상한)"""
+        return len(prompt) + max_tokens
+
+    def _record_success(self, start, estimated, usage):
+        latency = (time.perf_counter() - start) * 1000
+        used = usage.input_tokens + usage.output_tokens if usage is not None else estimated
+        self.limiter.tokens.refund(estimated - used)
+        self.breaker.record_success()
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _record_failure(self):
+        self.breaker.record_failure()
+        with self._lock:
+            self._failures += 1
+
+    def get_metrics(self):
+        """
+        요청/재시도/서킷 브레이커 지표
+
+        Returns:
+            dict: 누적 요청 수(재시도 포함), 실패/재시도/429 횟수, 차단된 호출 수,
+                속도 제한 대기 누적 시간, 지연 시간 p50/p95 (ms), 브레이커 상태
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            metrics = {
+                'requests': self._requests,
+                'failures': self._failures,
+                'retries': self._retries,
+                'rate_limited': self._rate_limited,
+                'short_circuited': self._short_circuited,
+                'limiter_wait_s': self._limiter_wait
+            }
+        metrics.update({
+            'latency_p50_ms': float(np.percentile(latencies, 50)) if latencies else 0.0,
+            'latency_p95_ms': float(np.percentile(latencies, 95)) if latencies else 0.0,
+            'breaker_state': self.breaker.state,
+            'breaker_opened': self.breaker.times_opened
+        })
+        return metrics
+
+    def close(self):
+        """연결 풀을 닫고 이벤트 루프 스레드 종료"""
+        self._run(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
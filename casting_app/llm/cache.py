@@ -0,0 +1,214 @@
+"""
+LLM 응답 캐시
+같은 프롬프트(공백 정규화 기준)에 대한 응답을 SQLite에 저장하여 재사용
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+
+import config
+
+
+def bucket_confidence(confidence, width=None):
+    """
+    신뢰도를 width 단위로 내림 (캐시 키 계산용 - 비슷한 신뢰도가 같은 캐시 키가 되도록)
+
+    내림이므로 width가 0.05의 약수이면 프롬프트의 신뢰도 기준(60/80/95%)을 넘어가지 않음
+    (config에서 검증)
+
+    Args:
+        confidence: 0~1 신뢰도
+        width: 구간 크기 (없으면 config.LLM_CACHE_CONFIDENCE_BUCKET, 0이면 그대로)
+
+    Returns:
+        float: 구간 시작값
+    """
+    width = config.LLM_CACHE_CONFIDENCE_BUCKET if width is None else width
+    if not width:
+        return confidence
+    # 0.95 / 0.01 = 94.999... 같은 부동소수점 오차 보정
+    return round(math.floor(confidence / width + 1e-9) * width, 6)
+
+
+class ResponseCache:
+    """TTL + LRU(최근 사용 순) 정책의 영구 응답 캐시 (여러 프로세스가 같은 파일 공유 가능)"""
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        """
+        Args:
+            path: SQLite 파일 경로 (없으면 config.LLM_CACHE_PATH)
+            ttl: 응답 유효 시간 (초, 없으면 config.LLM_CACHE_TTL, 0이면 만료 없음)
+            max_entries: 최대 항목 수 (없으면 config.LLM_CACHE_MAX_ENTRIES, 초과 시 오래 안 쓴 항목부터 삭제)
+        """
+        self.path = path or config.LLM_CACHE_PATH
+        self.ttl = config.LLM_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or config.LLM_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(prompt, **params):
+        """
+        캐시 키 생성 (연속 공백/줄바꿈 차이는 무시, 모델 설정 등 params가 다르면 다른 키)
+
+        Returns:
+            str: SHA-256 hex
+        """
+        normalized = ' '.join(prompt.split())
+        payload = json.dumps([normalized, params], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        캐시된 응답 조회 (만료된 항목은 삭제)
+
+        Returns:
+            str: 응답 (없거나 만료되었으면 None)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._expired += 1
+                row = None
+            if row is None:
+                self._misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self._hits += 1
+            return row[0]
+
+    def put(self, key, response):
+        """응답 저장 (max_entries 초과 시 가장 오래 사용되지 않은 항목 삭제)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+                self._evictions += count - self.max_entries
+            self._conn.commit()
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def get_metrics(self):
+        """
+        캐시 지표 (이 프로세스 기준, entries는 파일 전체)
+
+        Returns:
+            dict: hits, misses, hit_rate, expired, evictions, entries
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'expired': self._expired,
+                'evictions': self._evictions,
+                'entries': entries
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedClient:
+    """
+    LLM 클라이언트 앞에 응답 캐시를 두는 래퍼 (generate() 인터페이스 동일)
+
+    오류 응답("오류 발생: ...")은 캐시하지 않음
+    """
+
+    def __init__(self, client, cache):
+        """
+        Args:
+            client: generate(prompt, max_tokens=None)를 제공하는 클라이언트 (예: ClaudeClient)
+            cache: ResponseCache
+        """
+        self.client = client
+        self.cache = cache
+
+    def _key(self, prompt, max_tokens, key_prompt=None):
+        return self.cache.make_key(
+            key_prompt or prompt,
+            model=getattr(self.client, 'model_name', None),
+            temperature=getattr(self.client, 'temperature', None),
+            max_tokens=max_tokens or getattr(self.client, 'max_tokens', None)
+        )
+
+    def generate(self, prompt, max_tokens=None, key_prompt=None):
+        """
+        캐시에 있으면 저장된 응답, 없으면 client로 생성 후 저장
+        
+        Args:
+            prompt: LLM에 보낼 프롬프트
+            max_tokens: 최대 토큰 수
+            key_prompt: 캐시 키 계산에 쓸 프롬프트 (없으면 prompt, 예: 신뢰도를 구간으로 묶은 프롬프트)
+        """
+        key = self._key(prompt, max_tokens, key_prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.client.generate(prompt, max_tokens=max_tokens)
+        if not response.startswith("오류 발생:"):
+            self.cache.put(key, response)
+        return response
+
+    def generate_stream(self, prompt, max_tokens=None, key_prompt=None):
+        """캐시에 있으면 전체 응답을 한 번에, 없으면 스트리밍하면서 모아 두었다가 끝나면 저장"""
+        key = self._key(prompt, max_tokens, key_prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for text in self.client.generate_stream(prompt, max_tokens=max_tokens):
+            chunks.append(text)
+            yield text
+        # 오류로 끝난 스트림(마지막 조각이 오류 메시지)은 저장하지 않음
+        if chunks and not chunks[-1].startswith("오류 발생:"):
+            self.cache.put(key, ''.join(chunks))
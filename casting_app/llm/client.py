@@ -10,26 +10,29 @@ import config
 class ClaudeClient:
     """Claude AI 클라이언트 클래스"""
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, base_url=None):
         """
         Args:
             api_key: Anthropic API 키
+            base_url: API 주소 (없으면 config.ANTHROPIC_BASE_URL, 비어 있으면 기본 주소)
         """
         self.api_key = api_key or config.ANTHROPIC_API_KEY
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다")
         
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.base_url = base_url or config.ANTHROPIC_BASE_URL or None
+        self.client = anthropic.Anthropic(api_key=self.api_key, base_url=self.base_url)
         self.model_name = config.CLAUDE_MODEL
         self.temperature = config.LLM_TEMPERATURE
         self.max_tokens = config.LLM_MAX_TOKENS
     
-    def generate(self, prompt):
+    def generate(self, prompt, max_tokens=None):
         """
         텍스트 생성
         
         Args:
             prompt: 입력 프롬프트
+            max_tokens: 최대 출력 토큰 수 (없으면 config.LLM_MAX_TOKENS)
             
         Returns:
             str: 생성된 텍스트
@@ -37,7 +40,7 @@ class ClaudeClient:
         try:
             message = self.client.messages.create(
                 model=self.model_name,
-                max_tokens=self.max_tokens,
+                max_tokens=max_tokens or self.max_tokens,
                 temperature=self.temperature,
                 messages=[
                     {"role": "user", "content": prompt}
@@ -46,3 +49,28 @@ class ClaudeClient:
             return message.content[0].text
         except Exception as e:
             return f"오류 발생: {str(e)}"
+    
+    def generate_stream(self, prompt, max_tokens=None):
+        """
+        텍스트 생성 (스트리밍) - 생성되는 대로 텍스트 조각을 반환
+        
+        Args:
+            prompt: 입력 프롬프트
+            max_tokens: 최대 출력 토큰 수 (없으면 config.LLM_MAX_TOKENS)
+            
+        Yields:
+            str: 텍스트 조각 (이어 붙이면 generate()의 결과와 같은 형태)
+        """
+        try:
+            with self.client.messages.stream(
+                model=self.model_name,
+                max_tokens=max_tokens or self.max_tokens,
+                temperature=self.temperature,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            yield f"오류 발생: {str(e)}"
@@ -0,0 +1,116 @@
+"""
+LLM 응답 파서
+단일 호출 분석 응답을 상세 분석 / 권장 조치로 분리
+"""
+
+import json
+import re
+
+# "===ANALYSIS===" 구분자 줄 (앞뒤 공백, 마크다운 강조/헤더/코드 표시, 대소문자 차이 허용)
+_MARKER_PATTERN = re.compile(
+    r'^[\s>#*_`]*=+\s*(ANALYSIS|RECOMMENDATION)\s*=+[\s*_`]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+# 구분자를 빠뜨린 경우 권장 조치가 시작되는 제목
+_RECOMMENDATION_HEADING = re.compile(r'^#{1,4}\s*작업자 조치', re.MULTILINE)
+_CODE_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+
+def split_combined_response(text):
+    """
+    단일 호출 응답을 상세 분석과 권장 조치로 분리
+
+    다음 순서로 시도:
+    1. ANALYSIS / RECOMMENDATION 구분자
+    2. {"analysis": ..., "recommendation": ...} 형태의 JSON
+    3. "### 작업자 조치" 제목 위치
+
+    Args:
+        text: LLM 응답 텍스트
+
+    Returns:
+        tuple: (analysis, recommendation) - 찾지 못한 부분은 None
+            (응답이 잘린 경우 analysis만 있을 수 있음)
+    """
+    text = (text or '').strip()
+    if not text:
+        return None, None
+
+    sections = _split_by_markers(text)
+    if sections:
+        return sections.get('analysis') or None, sections.get('recommendation') or None
+
+    parsed = _parse_json(text)
+    if parsed:
+        return parsed
+
+    heading = _RECOMMENDATION_HEADING.search(text)
+    if heading and heading.start() > 0:
+        return text[:heading.start()].strip(), text[heading.start():].strip()
+
+    return None, None
+
+
+def split_partial_response(text):
+    """
+    스트리밍 도중의 응답을 화면 표시용 (analysis, recommendation)으로 분리
+
+    split_combined_response()와 달리 구분자 줄은 항상 숨기고, 아직 없는 부분은 빈 문자열로 반환
+
+    Args:
+        text: 지금까지 받은 응답 텍스트
+
+    Returns:
+        tuple: (analysis, recommendation)
+    """
+    text = strip_partial_marker(text)
+    sections = _split_by_markers(text)
+    if sections is not None:
+        return sections.get('analysis', ''), sections.get('recommendation', '')
+
+    analysis, recommendation = split_combined_response(text)
+    if analysis is None:
+        return text.strip(), ''
+    return analysis, recommendation or ''
+
+
+def strip_partial_marker(text):
+    """스트리밍 도중 아직 다 받지 못한 구분자 줄(예: "===RECOMM")이 끝에 있으면 제거"""
+    head, _, last = text.rpartition('\n')
+    if last.lstrip(' >#*_`').startswith('='):
+        return head
+    return text
+
+
+def _split_by_markers(text):
+    """구분자 사이의 내용을 {'analysis': ..., 'recommendation': ...}로 반환 (구분자가 없으면 None)"""
+    matches = list(_MARKER_PATTERN.finditer(text))
+    if not matches:
+        return None
+
+    sections = {}
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        # 같은 구분자가 반복되면 처음 것을 사용
+        sections.setdefault(match.group(1).lower(), text[match.end():end].strip())
+
+    if 'analysis' not in sections and matches[0].start() > 0:
+        # ANALYSIS 구분자만 빠진 경우 RECOMMENDATION 앞부분을 상세 분석으로 사용
+        sections['analysis'] = text[:matches[0].start()].strip()
+    return sections
+
+
+def _parse_json(text):
+    """JSON 형식 응답이면 (analysis, recommendation), 아니면 None"""
+    try:
+        data = json.loads(_CODE_FENCE.sub('', text))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    analysis, recommendation = data.get('analysis'), data.get('recommendation')
+    if not isinstance(analysis, str) or not analysis.strip():
+        return None
+    if not isinstance(recommendation, str) or not recommendation.strip():
+        recommendation = None
+    return analysis.strip(), recommendation.strip() if recommendation else None
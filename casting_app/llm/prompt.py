@@ -4,6 +4,21 @@
 """
 
 
+# 단일 호출 모드에서 응답을 상세 분석 / 권장 조치로 나누는 구분자 (llm/parser.py 참고)
+ANALYSIS_MARKER = "===ANALYSIS==="
+RECOMMENDATION_MARKER = "===RECOMMENDATION==="
+
+# 권장 조치 형식 (별도 호출/단일 호출 프롬프트 공통)
+RECOMMENDATION_STRUCTURE = """### 작업자 조치 (3가지 이내)
+- 첫 번째 조치
+- 두 번째 조치  
+- 세 번째 조치
+
+### QC 담당자 확인사항 (2가지)
+- 첫 번째 확인 사항
+- 두 번째 확인 사항"""
+
+
 class PromptBuilder:
     """프롬프트 생성 클래스 (현장 보고서 형식)"""
     
@@ -12,6 +27,26 @@ class PromptBuilder:
         """
         결함 분석 프롬프트 생성 (체계적 보고서 형식)
         
+        Args:
+            prediction: 예측 결과 (0 or 1)
+            confidence: 신뢰도
+            class_name: 클래스 이름
+            
+        Returns:
+            str: 프롬프트
+        """
+        return PromptBuilder._build_report_instructions(prediction, confidence, class_name) + """
+지금 바로 작성을 시작하세요.
+"""
+    
+    @staticmethod
+    def build_combined_analysis_prompt(prediction, confidence, class_name):
+        """
+        상세 분석(5개 항목)과 권장 조치를 한 번의 요청으로 받는 프롬프트 생성
+        
+        응답은 ANALYSIS_MARKER / RECOMMENDATION_MARKER 구분자로 나뉘며
+        llm.parser.split_combined_response()로 분리
+        
         Args:
             prediction: 예측 결과 (0 or 1)
             confidence: 신뢰도
@@ -21,6 +56,29 @@ class PromptBuilder:
             str: 프롬프트
         """
         status = "정상" if prediction == 0 else "불량"
+        
+        return PromptBuilder._build_report_instructions(prediction, confidence, class_name) + f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🧾 출력 형식
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+응답은 아래 두 구분자 줄로 나누어 작성하세요.
+구분자 줄은 정확히 그대로 한 번씩만 쓰고, 구분자 앞뒤에 다른 설명을 덧붙이지 마세요.
+
+{ANALYSIS_MARKER}
+(위 5가지 항목의 보고서)
+{RECOMMENDATION_MARKER}
+(현장 작업자와 품질관리 담당자를 위한 즉각 조치사항, 다음 구조로 작성)
+{RECOMMENDATION_STRUCTURE}
+
+즉각 조치사항은 {status} 판정에 맞게 구체적이고 실행 가능하게, 간결하고 명확하게 작성하세요.
+
+지금 바로 작성을 시작하세요.
+"""
+    
+    @staticmethod
+    def _build_report_instructions(prediction, confidence, class_name):
+        """5개 항목 보고서 작성 지침 (분석 프롬프트의 본문)"""
+        status = "정상" if prediction == 0 else "불량"
         confidence_pct = f"{confidence:.2%}"
         
         # f-string 안에서 백슬래시 사용을 피하기 위해 변수로 분리
@@ -82,8 +140,6 @@ class PromptBuilder:
 3. 전문 용어를 사용하되 설명을 병기
 4. 구체적인 수치와 기준을 명시
 5. 불필요한 장황함 없이 핵심만 간결하게
-
-지금 바로 작성을 시작하세요.
 """
     
     @staticmethod
@@ -108,14 +164,7 @@ class PromptBuilder:
 
 다음 구조로 작성하세요:
 
-### 작업자 조치 (3가지 이내)
-- 첫 번째 조치
-- 두 번째 조치  
-- 세 번째 조치
-
-### QC 담당자 확인사항 (2가지)
-- 첫 번째 확인 사항
-- 두 번째 확인 사항
+{RECOMMENDATION_STRUCTURE}
 
 {status} 판정에 맞는 구체적이고 실행 가능한 조치를 작성하세요.
 간결하고 명확하게 작성하세요.
@@ -0,0 +1,162 @@
+"""
+LLM 요청 안정화 도구
+토큰 버킷 속도 제한 / 지수 백오프 / 서킷 브레이커
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+
+class LLMUnavailableError(Exception):
+    """재시도 후에도 실패했거나 서킷 브레이커가 열려 있어 LLM을 사용할 수 없음"""
+
+
+class TokenBucket:
+    """
+    분당 rate만큼 채워지는 토큰 버킷 (용량 = 1분치)
+
+    AsyncClaudeClient의 이벤트 루프 한 곳에서만 사용 (asyncio.Lock으로 순서 보장)
+    """
+
+    def __init__(self, rate_per_minute):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount=1):
+        """
+        amount만큼 꺼낼 수 있을 때까지 대기 (용량보다 크면 용량만큼만 요구)
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                delay = (amount - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= amount
+        return waited
+
+    def refund(self, amount):
+        """미리 꺼낸 양 중 실제로 쓰지 않은 만큼 되돌림"""
+        if amount > 0:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """분당 요청 수 + 분당 토큰 수 제한 (둘 다 만족할 때까지 대기)"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, estimated_tokens):
+        """
+        요청 1건 + 예상 토큰 수만큼 확보
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        waited = await self.requests.acquire(1)
+        waited += await self.tokens.acquire(estimated_tokens)
+        return waited
+
+
+def backoff_delay(attempt, base_delay, max_delay, retry_after=None):
+    """
+    attempt번째 재시도 전 대기 시간 (지수 백오프 + full jitter)
+
+    Args:
+        attempt: 0부터 시작하는 재시도 번호
+        base_delay: 첫 재시도의 최대 대기 (초)
+        max_delay: 대기 상한 (초)
+        retry_after: 서버가 알려준 Retry-After (초, 있으면 그보다 짧게 기다리지 않음)
+    """
+    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, max_delay))
+    return delay
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold회에 도달하면 reset_timeout초 동안 요청을 차단(open)하고,
+    이후 한 건만 시험(half_open)하여 성공하면 다시 허용(closed)
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self):
+        """요청을 보내도 되는지 여부 (half_open에서는 한 건만 허용)"""
+        return self.acquire() is not None
+
+    def acquire(self):
+        """
+        요청 허용 여부 확인
+
+        half_open 상태에서 허용된 요청은 시험 요청이므로, 호출하는 쪽은 어떤 경로로 끝나든
+        (취소 포함) record_success()/record_failure() 중 하나를 반드시 호출해야 함
+
+        Returns:
+            str | None: 허용되면 현재 상태 (CLOSED 또는 HALF_OPEN), 차단되면 None
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return state
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return state
+            return None
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
@@ -10,7 +10,15 @@ class DefectAnalyzer:
     def run_analysis(self, result):
         # Calls the analyze method from the LLM analyzer
         analysis_result = self.analyzer.analyze(result)
-        
+        return self._format(analysis_result)
+
+    def run_analysis_stream(self, result):
+        # Yields the formatted report each time more text arrives (last one is final)
+        for analysis_result in self.analyzer.analyze_stream(result):
+            yield self._format(analysis_result)
+
+    @staticmethod
+    def _format(analysis_result):
         # Formatting the output for the UI
         return f"""
 ### 🧐 상세 분석 결과
@@ -19,3 +27,11 @@ class DefectAnalyzer:
 ### 🛠️ 권장 조치 사항
 {analysis_result['recommendation']}
 """
+
+    def get_cache_metrics(self):
+        # LLM 응답 캐시 지표 (캐시 미사용 시 None)
+        return self.analyzer.get_cache_metrics()
+
+    def get_client_metrics(self):
+        # LLM 클라이언트 지표 (async 모드에서만 제공, 그 외 None)
+        return self.analyzer.get_client_metrics()
@@ -0,0 +1,156 @@
+"""
+검사 결과 페이로드 저장소 (content-addressed)
+이미지 해시를 키로 썸네일, Grad-CAM 이미지, LLM 분석 텍스트를 보관하여
+과거 검사의 보고서 재생성/재검토를 재계산 없이 조회로 처리
+"""
+import hashlib
+import io
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+import config
+
+THUMBNAIL_FILE = 'thumbnail.jpg'
+CAM_FILE = 'cam.png'
+ANALYSIS_FILE = 'analysis.md'
+
+
+class BlobStore:
+    """root/ab/abcdef.../ 구조의 중복 제거 저장소 (용량 초과 시 오래 사용하지 않은 항목부터 삭제)"""
+    
+    def __init__(self, root=None, max_bytes=None):
+        """
+        Args:
+            root: 저장 디렉터리 (없으면 config.BLOB_STORE_DIR)
+            max_bytes: 최대 저장 용량 (없으면 config.BLOB_STORE_MAX_BYTES)
+        """
+        self.root = Path(root or config.BLOB_STORE_DIR)
+        self.max_bytes = max_bytes or config.BLOB_STORE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._total_bytes = None
+    
+    @staticmethod
+    def key_for(image_array):
+        """
+        이미지 내용 해시 (같은 이미지는 같은 키)
+        
+        Args:
+            image_array: prepare_array()로 만든 uint8 배열
+            
+        Returns:
+            str: sha256 hex
+        """
+        digest = hashlib.sha256()
+        digest.update(str(image_array.shape).encode())
+        digest.update(np.ascontiguousarray(image_array).tobytes())
+        return digest.hexdigest()
+    
+    def _dir(self, key):
+        return self.root / key[:2] / key
+    
+    def put_thumbnail(self, key, image):
+        """원본 이미지 썸네일 저장 (이미 있으면 건너뜀)"""
+        path = self._dir(key) / THUMBNAIL_FILE
+        if path.exists():
+            return
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        thumbnail = image.convert('RGB')
+        thumbnail.thumbnail(config.BLOB_THUMBNAIL_SIZE)
+        buffer = io.BytesIO()
+        thumbnail.save(buffer, format='JPEG', quality=85)
+        self._write(path, buffer.getvalue())
+    
+    def put_cam(self, key, cam_map):
+        """
+        Grad-CAM 히트맵 저장 (이미 있으면 건너뜀)
+        
+        오버레이 이미지 대신 (H, W) uint8 히트맵만 1채널 PNG로 저장하고,
+        조회 시 썸네일 위에 다시 채색
+        """
+        path = self._dir(key) / CAM_FILE
+        if path.exists():
+            return
+        buffer = io.BytesIO()
+        Image.fromarray(np.asarray(cam_map, dtype=np.uint8), mode='L').save(buffer, format='PNG')
+        self._write(path, buffer.getvalue())
+    
+    def put_analysis(self, key, text):
+        """LLM 분석 리포트 저장 (같은 이미지의 최신 분석으로 덮어씀)"""
+        self._write(self._dir(key) / ANALYSIS_FILE, text.encode('utf-8'))
+    
+    def get(self, key):
+        """
+        저장된 페이로드 조회
+        
+        Returns:
+            dict: {'thumbnail': PIL Image, 'cam_map': (H, W) uint8 히트맵,
+                'cam_image': numpy.ndarray (이전 형식으로 저장된 오버레이 이미지), 'analysis': str}
+                (저장되지 않은 항목은 None, 히트맵 채색은 호출하는 쪽에서 overlay_cam_map()으로 수행)
+        """
+        blob_dir = self._dir(key)
+        if not key or not blob_dir.exists():
+            return {'thumbnail': None, 'cam_map': None, 'cam_image': None, 'analysis': None}
+        # 최근 사용 시각 갱신 (용량 초과 시 삭제 순서에 사용)
+        os.utime(blob_dir)
+        
+        thumbnail = cam_map = cam_image = analysis = None
+        if (blob_dir / THUMBNAIL_FILE).exists():
+            thumbnail = Image.open(blob_dir / THUMBNAIL_FILE).convert('RGB')
+        if (blob_dir / CAM_FILE).exists():
+            cam_array = np.array(Image.open(blob_dir / CAM_FILE))
+            # 1채널은 uint8 히트맵, 3채널은 이전 형식인 오버레이 이미지
+            if cam_array.ndim == 2:
+                cam_map = cam_array
+            else:
+                cam_image = cam_array
+        if (blob_dir / ANALYSIS_FILE).exists():
+            analysis = (blob_dir / ANALYSIS_FILE).read_text(encoding='utf-8')
+        return {'thumbnail': thumbnail, 'cam_map': cam_map, 'cam_image': cam_image, 'analysis': analysis}
+    
+    def _write(self, path, data):
+        """원자적으로 기록하고 용량을 초과하면 정리"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        previous = path.stat().st_size if path.exists() else 0
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        os.utime(path.parent)
+        
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            else:
+                self._total_bytes += len(data) - previous
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.evict()
+    
+    def _blob_dirs(self):
+        if not self.root.exists():
+            return []
+        return [d for prefix in self.root.iterdir() if prefix.is_dir() for d in prefix.iterdir() if d.is_dir()]
+    
+    def _scan_total(self):
+        return sum(f.stat().st_size for d in self._blob_dirs() for f in d.iterdir() if f.is_file())
+    
+    def evict(self, target_ratio=0.9):
+        """최근 사용 시각이 오래된 항목부터 삭제하여 max_bytes * target_ratio 이하로 줄임"""
+        with self._lock:
+            entries = []
+            for blob_dir in self._blob_dirs():
+                size = sum(f.stat().st_size for f in blob_dir.iterdir() if f.is_file())
+                entries.append((blob_dir.stat().st_mtime, size, blob_dir))
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * target_ratio
+            for _, size, blob_dir in sorted(entries, key=lambda e: e[0]):
+                if total <= target:
+                    break
+                shutil.rmtree(blob_dir, ignore_errors=True)
+                total -= size
+            self._total_bytes = total
@@ -2,64 +2,125 @@
 검사 이력 관리 모듈
 """
 import pandas as pd
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-import json
+import config
+from classifiers.inspection_result import InspectionResult
+from services.history_archive import HistoryArchive
+from services.history_backends import TIMESTAMP_FORMAT, create_backend
+from services.history_rollups import HistoryRollups
+from utils.file_lock import FileLock
 
 
 class InspectionHistory:
     """검사 이력 저장 및 조회"""
     
-    def __init__(self, history_file="inspection_history.csv"):
-        self.history_file = Path(history_file)
-        self._init_history()
-    
-    def _init_history(self):
-        """이력 파일 초기화"""
-        if not self.history_file.exists():
-            df = pd.DataFrame(columns=[
-                'timestamp', 'prediction', 'class_name', 
-                'confidence', 'normal_prob', 'defect_prob'
-            ])
-            df.to_csv(self.history_file, index=False)
+    def __init__(self, history_file=None, backend=None):
+        """
+        Args:
+            history_file: 저장 파일 경로 (없으면 backend별 기본 경로)
+            backend: 'csv', 'sqlite' 또는 'parquet' (없으면 config.HISTORY_BACKEND)
+        """
+        backend = backend or config.HISTORY_BACKEND
+        history_file = history_file or config.HISTORY_PATHS[backend]
+        self.backend = create_backend(backend, history_file)
+        self.history_file = self.backend.path
+        
+        # 보관 기간이 지난 이력은 일별 압축 아카이브(콜드 계층)로 이동
+        self.archive = HistoryArchive(Path(f"{self.history_file}.archive"))
+        self.retention_days = config.HISTORY_RETENTION_DAYS
+        self._retention_lock = FileLock(Path(f"{self.history_file}.retention.lock"))
+        self._last_compaction = None
+        
+        # 통계용 롤업은 이력 옆에 저장 (없으면 원본 이력으로 1회 생성)
+        self.rollups = HistoryRollups.for_path(Path(f"{self.history_file}.rollups.json"))
+        if not self.rollups.loaded:
+            self.rebuild_statistics()
+        self._maybe_compact()
     
     def add_record(self, result):
-        """검사 결과 추가"""
-        record = {
-            'timestamp': result.get('inspection_time', datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+        """검사 결과 추가 (parquet backend는 버퍼에 모았다가 기록)"""
+        record = self.to_record(result)
+        self.backend.append(record)
+        self.rollups.add(record)
+        self._maybe_compact()
+    
+    def add_records(self, records):
+        """
+        to_record()로 변환된 레코드 여러 건을 한 번에 기록 (쓰기 지연 배치용, 바로 기록)
+        
+        Args:
+            records: 레코드 dict 리스트
+        """
+        self.backend.append_many(records)
+        for record in records:
+            self.rollups.add(record)
+        self._maybe_compact()
+    
+    @staticmethod
+    def to_record(result):
+        """검사 결과(InspectionResult 또는 dict) → 이력 레코드 dict (텐서/이미지 등 무거운 값은 제외)"""
+        if isinstance(result, InspectionResult):
+            normal_prob, defect_prob = result.normal_prob, result.defect_prob
+        else:
+            normal_prob, defect_prob = list(result['probabilities'].values())[:2]
+        return {
+            'timestamp': result.get('inspection_time', datetime.now()).strftime(TIMESTAMP_FORMAT),
             'prediction': result['prediction'],
             'class_name': result['class_name'],
             'confidence': result['confidence'],
-            'normal_prob': result['probabilities'][list(result['probabilities'].keys())[0]],
-            'defect_prob': result['probabilities'][list(result['probabilities'].keys())[1]]
+            'normal_prob': normal_prob,
+            'defect_prob': defect_prob,
+            'image_hash': result.get('image_hash', '')
         }
-        
-        df = pd.read_csv(self.history_file)
-        df = pd.concat([df, pd.DataFrame([record])], ignore_index=True)
-        df.to_csv(self.history_file, index=False)
     
-    def get_history(self, days=1):
-        """최근 N일 이력 조회"""
-        if not self.history_file.exists():
-            return pd.DataFrame()
-        
-        df = pd.read_csv(self.history_file)
-        if df.empty:
-            return df
-        
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        
-        # 최근 N일 필터
+    def get_history(self, days=1, columns=None):
+        """최근 N일 이력 조회 (columns 지정 시 해당 컬럼만, 필요한 경우에만 아카이브 포함)"""
         cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
-        df = df[df['timestamp'] >= cutoff]
+        df = self.backend.query(start=cutoff, columns=columns)
         
+        boundary = self._retention_boundary()
+        if boundary is not None and cutoff < boundary:
+            cold = self.archive.query(start=cutoff, end=boundary, columns=columns)
+            if not cold.empty:
+                df = pd.concat([cold, df], ignore_index=True) if not df.empty else cold
         return df
     
+    def iter_history(self, start=None, end=None, chunk_rows=10_000, columns=None):
+        """
+        기간 이력을 청크 단위로 반환 (긴 기간도 전체 DataFrame을 만들지 않음)
+        
+        아카이브(콜드 계층) → 핫 계층 순서로 반환
+        
+        Args:
+            start: 시작 시각 (포함, None이면 처음부터)
+            end: 종료 시각 (미포함, None이면 끝까지)
+            chunk_rows: 청크당 최대 행 수
+            columns: 조회할 컬럼 목록 (None이면 전체, timestamp는 항상 포함)
+            
+        Yields:
+            DataFrame: timestamp가 datetime으로 변환된 최대 chunk_rows행
+        """
+        boundary = self._retention_boundary()
+        if boundary is not None and (start is None or pd.Timestamp(start) < boundary):
+            cold_end = boundary if end is None else min(pd.Timestamp(end), boundary)
+            yield from self.archive.iter_query(start=start, end=cold_end, columns=columns, chunk_rows=chunk_rows)
+        yield from self.backend.iter_query(start=start, end=end, columns=columns, chunk_rows=chunk_rows)
+    
+    def get_recent_records(self, limit=10, days=None):
+        """최근 limit건 조회 (days 지정 시 최근 N일 이내로 제한)"""
+        cutoff = pd.Timestamp.now() - pd.Timedelta(days=days) if days else None
+        return self.backend.recent(limit, start=cutoff)
+    
     def get_statistics(self, days=1):
-        """통계 계산"""
-        df = self.get_history(days)
+        """통계 계산 (롤업 사용, 시간 단위 경계로 집계)"""
+        cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
+        summary = self.rollups.summarize(cutoff)
         
-        if df.empty:
+        total = summary['total']
+        if total == 0:
             return {
                 'total': 0,
                 'normal': 0,
@@ -69,9 +130,8 @@ class InspectionHistory:
                 'avg_confidence': 0.0
             }
         
-        total = len(df)
-        normal = len(df[df['prediction'] == 0])
-        defect = len(df[df['prediction'] == 1])
+        normal = summary['normal']
+        defect = summary['defect']
         
         return {
             'total': total,
@@ -79,5 +139,80 @@ class InspectionHistory:
             'defect': defect,
             'normal_rate': (normal / total * 100) if total > 0 else 0.0,
             'defect_rate': (defect / total * 100) if total > 0 else 0.0,
-            'avg_confidence': df['confidence'].mean() * 100
+            'avg_confidence': summary['confidence_sum'] / total * 100
         }
+    
+    def get_hourly_counts(self, days=1):
+        """
+        시간대(0~23시)별 클래스별 검사 건수 (롤업 사용)
+        
+        Returns:
+            DataFrame: index=hour, columns=클래스 이름
+        """
+        cutoff = pd.Timestamp.now() - pd.Timedelta(days=days)
+        return self.rollups.hourly_counts(cutoff)
+    
+    def rebuild_statistics(self):
+        """원본 이력 전체(아카이브 포함)로 롤업 재계산 (롤업 파일 유실 시, 또는 비정상 종료로 미저장 증분을 잃었을 때 수동으로)"""
+        columns = ['prediction', 'confidence']
+        frames = [df for df in (self.archive.query(columns=columns), self.backend.query(columns=columns))
+                  if not df.empty]
+        self.rollups.rebuild(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['timestamp'] + columns))
+    
+    def _retention_boundary(self):
+        """핫 계층의 시작 시각 (이보다 오래된 이력은 아카이브에 있음, 보관 정책 미사용 시 None)"""
+        if not self.retention_days:
+            return None
+        return pd.Timestamp.now().normalize() - pd.Timedelta(days=self.retention_days)
+    
+    def _maybe_compact(self):
+        """마지막 정리 후 HISTORY_COMPACTION_INTERVAL이 지났으면 백그라운드에서 정리"""
+        if not self.retention_days:
+            return
+        now = time.monotonic()
+        if self._last_compaction is not None and now - self._last_compaction < config.HISTORY_COMPACTION_INTERVAL:
+            return
+        self._last_compaction = now
+        threading.Thread(target=self._compact_in_background, name='HistoryCompaction', daemon=True).start()
+    
+    def _compact_in_background(self):
+        try:
+            self.compact_history()
+        except Exception as e:
+            print(f"Warning: 이력 보관 정리 실패 - {e}")
+    
+    def compact_history(self):
+        """
+        보관 기간(HISTORY_RETENTION_DAYS)이 지난 이력을 핫 계층에서 빼서 일별 압축 아카이브로 이동
+        
+        Returns:
+            int: 아카이브로 이동한 레코드 수
+        """
+        boundary = self._retention_boundary()
+        if boundary is None:
+            return 0
+        
+        # 여러 프로세스 중 한 곳에서만 정리
+        with self._retention_lock:
+            self._recover_compaction()
+            try:
+                # 아카이브 기록이 성공한 뒤에만 핫 계층에서 제거
+                old = self.backend.pop_before(boundary, before_commit=self.archive.add)
+            except Exception:
+                self._recover_compaction()
+                raise
+            self.archive.commit()
+        return len(old)
+    
+    def _recover_compaction(self):
+        """
+        아카이브 기록 후 핫 계층 제거 전에 중단된 정리 작업 복구
+        
+        핫 계층에 아직 남아 있는 날짜는 아카이브에서 되돌리고 (다음 정리에서 다시 이동),
+        이미 제거된 날짜는 확정
+        """
+        end = self.archive.pending_end()
+        if end is None:
+            return
+        remaining = self.backend.query(end=end, columns=['timestamp'])
+        self.archive.rollback(days=set(remaining['timestamp'].dt.strftime('%Y-%m-%d')))
@@ -0,0 +1,169 @@
+"""
+검사 이력 콜드 아카이브
+보관 기간이 지난 이력을 일 단위 gzip CSV로 압축 보관하고, 필요한 날짜만 읽음
+"""
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from services.history_backends import COLUMNS, TIMESTAMP_FORMAT, _filter_range, _with_timestamp
+
+DAY_FORMAT = '%Y-%m-%d'
+SUFFIX = '.csv.gz'
+PENDING_FILE = '.pending.json'
+
+
+class HistoryArchive:
+    """root/YYYY-MM-DD.csv.gz 형태의 일별 압축 아카이브"""
+    
+    def __init__(self, root):
+        """
+        Args:
+            root: 아카이브 디렉터리 (처음 기록할 때 생성)
+        """
+        self.root = Path(root)
+    
+    def days(self):
+        """아카이브된 날짜 목록 (정렬)"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name[:-len(SUFFIX)] for p in self.root.glob(f'*{SUFFIX}'))
+    
+    @property
+    def _pending_path(self):
+        return self.root / PENDING_FILE
+    
+    def add(self, df):
+        """
+        레코드를 날짜별 파일 끝에 추가 (날짜 파일마다 임시 파일에 쓴 뒤 원자적으로 교체)
+        
+        같은 값의 검사가 여러 건일 수 있으므로 내용으로 중복을 제거하지 않음. 대신 기록 전에
+        날짜별 기존 행 수를 pending 기록으로 남기고, commit() 전에 중단되면 rollback()으로 되돌림
+        
+        Args:
+            df: COLUMNS 컬럼을 가진 DataFrame (timestamp는 문자열 또는 datetime)
+        """
+        if df.empty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        
+        df = df.reindex(columns=COLUMNS)
+        timestamps = pd.to_datetime(df['timestamp'])
+        df['timestamp'] = timestamps.dt.strftime(TIMESTAMP_FORMAT)
+        df = df.fillna('').astype(str)
+        
+        parts, counts = [], {}
+        for day, part in df.groupby(df['timestamp'].str[:10]):
+            path = self.root / f"{day}{SUFFIX}"
+            part = part.sort_values('timestamp', kind='stable')
+            counts[day] = 0
+            if path.exists():
+                existing = pd.read_csv(path, dtype=str, keep_default_na=False)
+                counts[day] = len(existing)
+                part = pd.concat([existing, part], ignore_index=True)
+            parts.append((path, part))
+        
+        self._write_atomic(self._pending_path, json.dumps({
+            # 이 시각 이전(미포함) 레코드가 핫 계층에 남아 있는지로 중단 시점을 판단
+            'end': (timestamps.max() + pd.Timedelta(seconds=1)).strftime(TIMESTAMP_FORMAT),
+            'days': counts
+        }).encode('utf-8'))
+        for path, part in parts:
+            self._write_day(path, part)
+    
+    def pending_end(self):
+        """확정되지 않은 add()가 있으면 그 레코드의 종료 시각(미포함), 없으면 None"""
+        if not self._pending_path.exists():
+            return None
+        return pd.Timestamp(json.loads(self._pending_path.read_text(encoding='utf-8'))['end'])
+    
+    def commit(self):
+        """add()로 기록한 내용을 확정 (핫 계층에서 제거된 뒤 호출)"""
+        self._pending_path.unlink(missing_ok=True)
+    
+    def rollback(self, days=None):
+        """
+        확정되지 않은 add()를 되돌림 (날짜 파일을 기록 전 행 수로 복원)
+        
+        Args:
+            days: 되돌릴 날짜('YYYY-MM-DD') 목록 (None이면 전부, 나머지 날짜는 확정)
+        """
+        if not self._pending_path.exists():
+            return
+        pending = json.loads(self._pending_path.read_text(encoding='utf-8'))
+        for day, count in pending['days'].items():
+            path = self.root / f"{day}{SUFFIX}"
+            if (days is not None and day not in days) or not path.exists():
+                continue
+            if count == 0:
+                path.unlink()
+            else:
+                self._write_day(path, pd.read_csv(path, dtype=str, keep_default_na=False).head(count))
+        self.commit()
+    
+    def _write_day(self, path, df):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        df.to_csv(tmp_path, index=False, compression='gzip')
+        os.replace(tmp_path, path)
+    
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    
+    def query(self, start=None, end=None, columns=None):
+        """
+        기간 조회 (기간에 해당하는 날짜 파일만 읽음)
+        
+        Args:
+            start: 시작 시각 (포함, None이면 처음부터)
+            end: 종료 시각 (미포함, None이면 끝까지)
+            columns: 조회할 컬럼 목록 (None이면 전체, timestamp는 항상 포함)
+            
+        Returns:
+            DataFrame: timestamp가 datetime으로 변환된 이력
+        """
+        columns = _with_timestamp(columns)
+        days = self._days_between(start, end)
+        if not days:
+            return pd.DataFrame(columns=columns)
+        
+        # 이전 버전에서 만든 파일에 없는 컬럼은 빈 값으로 채움
+        df = pd.concat(
+            (pd.read_csv(self.root / f"{day}{SUFFIX}", usecols=lambda c: c in columns).reindex(columns=columns)
+             for day in days),
+            ignore_index=True
+        )
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format=TIMESTAMP_FORMAT)
+        return _filter_range(df, start, end).reset_index(drop=True)
+    
+    def iter_query(self, start=None, end=None, columns=None, chunk_rows=10_000):
+        """
+        기간 조회를 청크 단위로 반환 (날짜 파일을 순서대로 chunk_rows행씩 압축 해제)
+        
+        Args:
+            start, end, columns: query()와 동일
+            chunk_rows: 한 번에 읽는 최대 행 수
+            
+        Yields:
+            DataFrame: 기간 조건을 만족하는 최대 chunk_rows행
+        """
+        columns = _with_timestamp(columns)
+        for day in self._days_between(start, end):
+            reader = pd.read_csv(self.root / f"{day}{SUFFIX}", usecols=lambda c: c in columns, chunksize=chunk_rows)
+            for chunk in reader:
+                chunk = chunk.reindex(columns=columns)
+                chunk['timestamp'] = pd.to_datetime(chunk['timestamp'], format=TIMESTAMP_FORMAT)
+                chunk = _filter_range(chunk, start, end)
+                if not chunk.empty:
+                    yield chunk.reset_index(drop=True)
+    
+    def _days_between(self, start=None, end=None):
+        """기간과 겹치는 아카이브 날짜 목록"""
+        first = pd.Timestamp(start).strftime(DAY_FORMAT) if start is not None else None
+        last = pd.Timestamp(end).strftime(DAY_FORMAT) if end is not None else None
+        return [d for d in self.days() if (first is None or d >= first) and (last is None or d <= last)]
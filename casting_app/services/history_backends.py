@@ -0,0 +1,687 @@
+"""
+검사 이력 저장소 backend
+InspectionHistory가 사용하는 저장 방식 (CSV / SQLite / Parquet)
+"""
+import atexit
+import csv
+import io
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import config
+from utils.file_lock import FileLock
+
+COLUMNS = [
+    'timestamp', 'prediction', 'class_name',
+    'confidence', 'normal_prob', 'defect_prob',
+    'image_hash'  # BlobStore 키 (썸네일/Grad-CAM/분석 조회용, 없으면 빈 문자열)
+]
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class CSVHistoryBackend:
+    """CSV 파일 backend (append 쓰기, 조회 시 전체 파일 파싱)"""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        # 여러 프로세스가 같은 파일에 쓰므로 헤더 생성과 append는 파일 잠금 안에서 수행
+        self._file_lock = FileLock(self.path.with_name(self.path.name + '.lock'))
+        with self._file_lock:
+            if not self.path.exists():
+                pd.DataFrame(columns=COLUMNS).to_csv(self.path, index=False)
+            else:
+                self._upgrade_header()
+    
+    def _upgrade_header(self):
+        """예전 형식(컬럼이 더 적은) 파일의 헤더를 현재 COLUMNS로 교체 (1회, 기존 행은 그대로)"""
+        with open(self.path, encoding='utf-8') as f:
+            header = f.readline().strip()
+        if header == ','.join(COLUMNS) or not header.startswith('timestamp'):
+            return
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(self.path, encoding='utf-8') as src, open(tmp_path, 'w', encoding='utf-8', newline='') as dst:
+            src.readline()
+            dst.write(','.join(COLUMNS) + '\n')
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, self.path)
+    
+    def append(self, record):
+        """레코드 1건 추가 (기존 파일을 다시 읽지 않고 한 행만 덧붙임, O(1))"""
+        self.append_many([record])
+    
+    def append_many(self, records):
+        """여러 레코드를 잠금 안에서 한 번의 write로 덧붙임 (다른 프로세스의 행과 섞이지 않음)"""
+        buffer = io.StringIO()
+        # 헤더/기존 행과 같은 줄바꿈('\n') 사용 (csv 기본값은 '\r\n')
+        csv.writer(buffer, lineterminator='\n').writerows([record[column] for column in COLUMNS] for record in records)
+        with self._file_lock:
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                f.write(buffer.getvalue())
+    
+    def query(self, start=None, end=None, columns=None):
+        """
+        기간 조회
+        
+        Args:
+            start: 시작 시각 (포함, None이면 처음부터)
+            end: 종료 시각 (미포함, None이면 끝까지)
+            columns: 조회할 컬럼 목록 (None이면 전체, timestamp는 항상 포함)
+            
+        Returns:
+            DataFrame: timestamp가 datetime으로 변환된 이력
+        """
+        columns = _with_timestamp(columns)
+        if not self.path.exists():
+            return pd.DataFrame(columns=columns)
+        
+        df = pd.read_csv(self.path, usecols=columns)
+        if df.empty:
+            return df
+        
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        if start is not None:
+            df = df[df['timestamp'] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df['timestamp'] < pd.Timestamp(end)]
+        return df
+    
+    def iter_query(self, start=None, end=None, columns=None, chunk_rows=10_000):
+        """
+        기간 조회를 청크 단위로 반환 (파일을 chunk_rows행씩 읽으므로 메모리 사용량이 일정)
+        
+        Args:
+            start, end, columns: query()와 동일
+            chunk_rows: 한 번에 읽는 최대 행 수
+            
+        Yields:
+            DataFrame: 기간 조건을 만족하는 행 (최대 chunk_rows행, 빈 청크는 건너뜀)
+        """
+        columns = _with_timestamp(columns)
+        if not self.path.exists():
+            return
+        
+        for chunk in pd.read_csv(self.path, usecols=columns, chunksize=chunk_rows):
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp'])
+            chunk = _filter_range(chunk, start, end)
+            if not chunk.empty:
+                yield chunk.reset_index(drop=True)
+    
+    def recent(self, limit, start=None):
+        """
+        최근 limit건 조회 (파일 끝부분만 읽음)
+        
+        Args:
+            limit: 최대 건수
+            start: 이 시각 이후 레코드만 (None이면 제한 없음)
+            
+        Returns:
+            DataFrame: 시간 순으로 정렬된 최근 레코드
+        """
+        if not self.path.exists():
+            return pd.DataFrame(columns=COLUMNS)
+        
+        lines = _tail_lines(self.path, limit)
+        if lines and lines[0].startswith('timestamp,'):
+            lines = lines[1:]
+        df = pd.read_csv(io.StringIO('\n'.join([','.join(COLUMNS)] + lines)))
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        if start is not None:
+            df = df[df['timestamp'] >= pd.Timestamp(start)]
+        # 여러 프로세스/비동기 배치가 기록한 순서는 시간 순과 다를 수 있으므로 다른 backend와 같이 정렬
+        return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+    
+    def pop_before(self, cutoff, before_commit=None):
+        """
+        cutoff 이전 레코드를 파일에서 제거하고 반환 (보관 기간 정리용)
+        
+        append와 같은 파일 잠금 안에서 나머지 행만 새 파일로 쓰고 교체하므로
+        그 사이에 다른 프로세스가 추가한 행은 잃지 않음
+        
+        Args:
+            cutoff: 이 시각 이전 레코드를 제거
+            before_commit: 제거하기 전에 제거할 레코드로 호출할 함수 (예: 아카이브 기록,
+                예외가 발생하면 아무것도 제거하지 않음)
+            
+        Returns:
+            DataFrame: 제거된 레코드 (값은 문자열)
+        """
+        cutoff_str = pd.Timestamp(cutoff).strftime(TIMESTAMP_FORMAT)
+        with self._file_lock:
+            # 문자열 그대로 읽고 써서 남는 행의 표현이 바뀌지 않도록 함
+            df = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+            old_mask = df['timestamp'] < cutoff_str
+            if not old_mask.any():
+                return df.iloc[0:0]
+            if before_commit is not None:
+                before_commit(df[old_mask])
+            
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            df[~old_mask].to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.path)
+        return df[old_mask]
+
+
+def _tail_lines(path, count, block_size=65536):
+    """파일 끝에서부터 블록 단위로 읽어 마지막 count개 줄 반환"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        while position > 0 and data.count(b'\n') <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    lines = data.decode('utf-8').splitlines()
+    if position > 0:
+        # 블록 경계에서 잘린 첫 줄은 버림
+        lines = lines[1:]
+    return [line for line in lines if line][-count:]
+
+
+class SQLiteHistoryBackend:
+    """SQLite(WAL) backend - timestamp 인덱스로 기간 조회를 SQL에서 처리"""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # Streamlit은 세션마다 다른 스레드에서 실행되므로 연결을 공유하고 lock으로 보호
+        # 다른 프로세스가 쓰는 중이면 timeout까지 대기 (WAL 모드에서 쓰기는 한 번에 하나)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS inspections (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    prediction INTEGER NOT NULL,
+                    class_name TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    normal_prob REAL NOT NULL,
+                    defect_prob REAL NOT NULL,
+                    image_hash TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(inspections)")}
+            if 'image_hash' not in existing:
+                self._conn.execute("ALTER TABLE inspections ADD COLUMN image_hash TEXT NOT NULL DEFAULT ''")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_inspections_timestamp ON inspections (timestamp)"
+            )
+            self._conn.commit()
+    
+    def append(self, record):
+        """레코드 1건 추가"""
+        self.append_many([record])
+    
+    def append_many(self, records):
+        """여러 레코드를 하나의 트랜잭션으로 추가"""
+        placeholders = ', '.join('?' for _ in COLUMNS)
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO inspections ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                [tuple(record[column] for column in COLUMNS) for record in records]
+            )
+            self._conn.commit()
+    
+    def query(self, start=None, end=None, columns=None):
+        """
+        기간 조회 (WHERE 조건이 timestamp 인덱스를 사용하므로 조회 기간 크기에 비례)
+        
+        Args:
+            start: 시작 시각 (포함, None이면 처음부터)
+            end: 종료 시각 (미포함, None이면 끝까지)
+            columns: 조회할 컬럼 목록 (None이면 전체, timestamp는 항상 포함)
+            
+        Returns:
+            DataFrame: timestamp가 datetime으로 변환된 이력
+        """
+        columns = _with_timestamp(columns)
+        sql, params = self._range_sql(columns, start, end)
+        
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format=TIMESTAMP_FORMAT)
+        return df
+    
+    def iter_query(self, start=None, end=None, columns=None, chunk_rows=10_000):
+        """
+        기간 조회를 청크 단위로 반환 (커서에서 chunk_rows행씩 가져옴)
+        
+        공유 연결을 잡고 있으면 소비하는 동안 쓰기가 막히므로 별도의 읽기 연결을 사용하며,
+        WAL 모드에서는 시작 시점의 스냅샷을 읽음
+        
+        Args:
+            start, end, columns: query()와 동일
+            chunk_rows: 한 번에 가져오는 최대 행 수
+            
+        Yields:
+            DataFrame: 시간 순으로 정렬된 최대 chunk_rows행
+        """
+        columns = _with_timestamp(columns)
+        sql, params = self._range_sql(columns, start, end)
+        
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                chunk = pd.DataFrame.from_records(rows, columns=columns)
+                chunk['timestamp'] = pd.to_datetime(chunk['timestamp'], format=TIMESTAMP_FORMAT)
+                yield chunk
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _range_sql(columns, start=None, end=None):
+        """기간 조회 SELECT 문과 파라미터"""
+        # 저장된 timestamp는 초 단위이므로 경계를 초 단위로 올림해야 소수 초가 있는 경계와 결과가 같음
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(pd.Timestamp(start).ceil('s').strftime(TIMESTAMP_FORMAT))
+        if end is not None:
+            conditions.append("timestamp < ?")
+            params.append(pd.Timestamp(end).ceil('s').strftime(TIMESTAMP_FORMAT))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"SELECT {', '.join(columns)} FROM inspections {where} ORDER BY timestamp, id", params
+    
+    def recent(self, limit, start=None):
+        """
+        최근 limit건 조회
+        
+        Args:
+            limit: 최대 건수
+            start: 이 시각 이후 레코드만 (None이면 제한 없음)
+            
+        Returns:
+            DataFrame: 시간 순으로 정렬된 최근 레코드
+        """
+        where, params = "", []
+        if start is not None:
+            where = "WHERE timestamp >= ?"
+            params.append(pd.Timestamp(start).strftime(TIMESTAMP_FORMAT))
+        params.append(int(limit))
+        
+        with self._lock:
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(COLUMNS)} FROM inspections {where} "
+                f"ORDER BY timestamp DESC, id DESC LIMIT ?",
+                self._conn,
+                params=params
+            )
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format=TIMESTAMP_FORMAT)
+        return df.iloc[::-1].reset_index(drop=True)
+    
+    def pop_before(self, cutoff, before_commit=None):
+        """
+        cutoff 이전 레코드를 삭제하고 반환 (보관 기간 정리용, 하나의 트랜잭션)
+        
+        Args:
+            cutoff: 이 시각 이전 레코드를 제거
+            before_commit: 삭제하기 전에 제거할 레코드로 호출할 함수 (예: 아카이브 기록,
+                예외가 발생하면 트랜잭션을 되돌림)
+            
+        Returns:
+            DataFrame: 제거된 레코드
+        """
+        cutoff_str = pd.Timestamp(cutoff).strftime(TIMESTAMP_FORMAT)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                df = pd.read_sql_query(
+                    f"SELECT {', '.join(COLUMNS)} FROM inspections WHERE timestamp < ? ORDER BY timestamp, id",
+                    self._conn,
+                    params=[cutoff_str]
+                )
+                if before_commit is not None and not df.empty:
+                    before_commit(df)
+                self._conn.execute("DELETE FROM inspections WHERE timestamp < ?", [cutoff_str])
+                self._conn.commit()
+            except BaseException:
+                # before_commit 도중 중단(KeyboardInterrupt 등)되어도 트랜잭션이 열린 채 남지 않도록 함
+                self._conn.rollback()
+                raise
+        return df
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ParquetHistoryBackend:
+    """
+    날짜별 파티션 Parquet backend (장기간 분석용)
+    
+    path/date=YYYY-MM-DD/part-*.parquet 구조로 저장하며, 쓰기는 메모리 버퍼에 모았다가
+    flush_rows건 또는 flush_interval초마다 파티션별로 한 번에 기록.
+    조회 시에는 기간에 해당하는 날짜 파티션만 읽고 필요한 컬럼만 읽으며,
+    아직 기록하지 않은 버퍼는 파일로 쓰지 않고 메모리에서 함께 반환
+    """
+    
+    def __init__(self, path, flush_rows=None, flush_interval=None, compact_parts=None):
+        """
+        Args:
+            path: 파티션 루트 디렉터리
+            flush_rows: 버퍼를 기록할 레코드 수 (없으면 config.HISTORY_PARQUET_FLUSH_ROWS)
+            flush_interval: 버퍼를 기록할 최대 간격 (초, 없으면 config.HISTORY_PARQUET_FLUSH_INTERVAL)
+            compact_parts: 파티션의 part 파일이 이만큼 쌓이면 기록 후 하나로 합침
+                (없으면 config.HISTORY_PARQUET_COMPACT_PARTS)
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("parquet 이력 backend를 사용하려면 'pip install pyarrow'가 필요합니다")
+        
+        self._pa, self._pq = pa, pq
+        self.schema = pa.schema([
+            ('timestamp', pa.timestamp('s')),
+            ('prediction', pa.int8()),
+            ('class_name', pa.string()),
+            ('confidence', pa.float64()),
+            ('normal_prob', pa.float64()),
+            ('defect_prob', pa.float64()),
+            ('image_hash', pa.string())
+        ])
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = flush_rows or config.HISTORY_PARQUET_FLUSH_ROWS
+        self.flush_interval = flush_interval or config.HISTORY_PARQUET_FLUSH_INTERVAL
+        self.compact_parts = compact_parts or config.HISTORY_PARQUET_COMPACT_PARTS
+        
+        self._lock = threading.Lock()
+        # part 파일 쓰기는 프로세스마다 고유한 이름을 쓰므로 안전하지만, 합치기/제거는 한 프로세스만 수행
+        self._compact_lock = FileLock(self.path / '.compact.lock')
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        # 프로세스 종료 시 버퍼에 남은 레코드 기록
+        atexit.register(self.flush)
+    
+    def append(self, record):
+        """레코드 1건을 버퍼에 추가 (조건 충족 시 기록)"""
+        with self._lock:
+            self._buffer.append(record)
+            due = (len(self._buffer) >= self.flush_rows
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+    
+    def append_many(self, records):
+        """여러 레코드를 버퍼에 추가한 뒤 바로 기록"""
+        with self._lock:
+            self._buffer.extend(records)
+        self.flush()
+    
+    def flush(self):
+        """버퍼의 레코드를 날짜 파티션별 Parquet 파일로 기록 (part 파일이 많이 쌓인 파티션은 합침)"""
+        written = []
+        with self._lock:
+            records, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+            if not records:
+                return
+            
+            table = self._records_table(records)
+            days = table.column('timestamp').to_pandas().dt.strftime('%Y-%m-%d')
+            for day, indices in days.groupby(days).groups.items():
+                partition = self.path / f"date={day}"
+                partition.mkdir(exist_ok=True)
+                name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+                self._write_part(table.take(list(indices)), partition / name)
+                written.append(partition)
+        
+        for partition in written:
+            if sum(1 for _ in partition.glob('*.parquet')) >= self.compact_parts:
+                with self._compact_lock:
+                    self._compact_partition(partition)
+    
+    def _records_table(self, records):
+        """레코드 dict 리스트 → schema를 따르는 Arrow 테이블"""
+        df = pd.DataFrame.from_records(records, columns=COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format=TIMESTAMP_FORMAT)
+        return self._pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+    
+    def _write_part(self, table, path):
+        """임시 파일에 쓴 뒤 교체 (다른 프로세스가 기록 중인 파일을 읽지 않도록)"""
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        self._pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    
+    def _partitions(self, start=None, end=None):
+        """기간과 겹치는 날짜 파티션 디렉터리 (파티션 pruning)"""
+        first = pd.Timestamp(start).strftime('%Y-%m-%d') if start is not None else None
+        last = pd.Timestamp(end).strftime('%Y-%m-%d') if end is not None else None
+        partitions = []
+        for partition in sorted(self.path.glob('date=*')):
+            day = partition.name[len('date='):]
+            if (first is None or day >= first) and (last is None or day <= last):
+                partitions.append(partition)
+        return partitions
+    
+    def _snapshot(self, start=None, end=None):
+        """
+        기간과 겹치는 파티션별 part 파일 목록과 아직 기록하지 않은 버퍼 레코드
+        
+        합치는 도중의 파일 목록을 보지 않도록 합치기 잠금 안에서 나열하고,
+        같은 레코드가 파일과 버퍼에 함께 보이지 않도록 flush()와 같은 잠금 안에서 버퍼를 복사
+        
+        Returns:
+            tuple: ([(파티션, part 파일 목록)], 버퍼 레코드 리스트)
+        """
+        with self._compact_lock, self._lock:
+            files = [(partition, sorted(partition.glob('*.parquet'))) for partition in self._partitions(start, end)]
+            return files, list(self._buffer)
+    
+    def _read_snapshot(self, read, start=None, end=None):
+        """_snapshot() 결과로 read(files, buffered) 호출 (읽는 도중 다른 프로세스가 합친 경우 다시 시도)"""
+        while True:
+            files, buffered = self._snapshot(start, end)
+            try:
+                return read(files, buffered)
+            except FileNotFoundError:
+                continue
+    
+    def query(self, start=None, end=None, columns=None):
+        """
+        기간 조회 (기간 밖의 날짜 파티션은 열지 않고, 요청한 컬럼만 읽음)
+        
+        Args:
+            start: 시작 시각 (포함, None이면 처음부터)
+            end: 종료 시각 (미포함, None이면 끝까지)
+            columns: 조회할 컬럼 목록 (None이면 전체, timestamp는 항상 포함)
+            
+        Returns:
+            DataFrame: timestamp가 datetime으로 변환된 이력
+        """
+        columns = _with_timestamp(columns)
+        
+        def read(files, buffered):
+            tables = [self._pq.read_table(f, columns=columns, schema=self.schema)
+                      for _, partition_files in files for f in partition_files]
+            if buffered:
+                tables.append(self._records_table(buffered).select(columns))
+            return tables
+        
+        tables = self._read_snapshot(read, start, end)
+        if not tables:
+            return pd.DataFrame(columns=columns)
+        
+        df = _filter_range(self._pa.concat_tables(tables).to_pandas(), start, end)
+        return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+    
+    def iter_query(self, start=None, end=None, columns=None, chunk_rows=10_000):
+        """
+        기간 조회를 청크 단위로 반환 (part 파일을 chunk_rows행 배치로 읽음)
+        
+        날짜 파티션 순서대로 반환하며, 같은 날짜 안에서는 part 파일(기록) 순서를 따르고
+        아직 기록하지 않은 버퍼는 마지막에 반환
+        
+        Args:
+            start, end, columns: query()와 동일
+            chunk_rows: 한 번에 읽는 최대 행 수
+            
+        Yields:
+            DataFrame: 기간 조건을 만족하는 최대 chunk_rows행
+        """
+        columns = _with_timestamp(columns)
+        files, buffered = self._snapshot(start, end)
+        
+        for _, partition_files in files:
+            for f in partition_files:
+                try:
+                    parquet_file = self._pq.ParquetFile(f)
+                except FileNotFoundError:
+                    # 읽는 도중 다른 프로세스가 compact()로 합친 경우
+                    continue
+                for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+                    chunk = _filter_range(batch.to_pandas(), start, end)
+                    if not chunk.empty:
+                        yield chunk.reset_index(drop=True)
+        
+        if buffered:
+            chunk = _filter_range(self._records_table(buffered).select(columns).to_pandas(), start, end)
+            for offset in range(0, len(chunk), chunk_rows):
+                yield chunk.iloc[offset:offset + chunk_rows].reset_index(drop=True)
+    
+    def recent(self, limit, start=None):
+        """
+        최근 limit건 조회 (버퍼와 최신 날짜 파티션부터 필요한 만큼만 읽음)
+        
+        Args:
+            limit: 최대 건수
+            start: 이 시각 이후 레코드만 (None이면 제한 없음)
+            
+        Returns:
+            DataFrame: 시간 순으로 정렬된 최근 레코드
+        """
+        def read(files, buffered):
+            frames = []
+            if buffered:
+                frames.append(_filter_range(self._records_table(buffered).to_pandas(), start))
+            rows = sum(len(df) for df in frames)
+            for _, partition_files in reversed(files):
+                if rows >= limit:
+                    break
+                if not partition_files:
+                    continue
+                df = self._pa.concat_tables(
+                    self._pq.read_table(f, schema=self.schema) for f in partition_files
+                ).to_pandas()
+                df = _filter_range(df, start)
+                frames.insert(0, df)
+                rows += len(df)
+            return frames
+        
+        frames = self._read_snapshot(read, start)
+        if not frames:
+            return pd.DataFrame(columns=COLUMNS)
+        df = pd.concat(frames, ignore_index=True).sort_values('timestamp', kind='stable')
+        return df.tail(limit).reset_index(drop=True)
+    
+    def compact(self, before=None):
+        """
+        날짜 파티션의 작은 part 파일들을 하나로 합침 (기본: 오늘 이전 파티션)
+        
+        part 파일이 compact_parts개 이상 쌓인 파티션은 flush() 후에 자동으로 합침
+        
+        Args:
+            before: 이 날짜 이전 파티션만 합침 (None이면 오늘)
+        """
+        self.flush()
+        cutoff = pd.Timestamp(before or pd.Timestamp.now()).strftime('%Y-%m-%d')
+        with self._compact_lock:
+            for partition in self._partitions():
+                if partition.name[len('date='):] < cutoff:
+                    self._compact_partition(partition)
+    
+    def _compact_partition(self, partition):
+        """파티션의 part 파일들을 시간 순으로 정렬된 하나의 파일로 합침 (self._compact_lock 안에서 호출)"""
+        files = sorted(partition.glob('*.parquet'))
+        if len(files) <= 1:
+            return
+        table = self._pa.concat_tables(self._pq.read_table(f, schema=self.schema) for f in files)
+        self._write_part(table.sort_by('timestamp'), partition / f"part-{time.time_ns()}-compacted.parquet")
+        for f in files:
+            f.unlink()
+    
+    def pop_before(self, cutoff, before_commit=None):
+        """
+        cutoff 날짜 이전의 날짜 파티션을 제거하고 레코드 반환 (보관 기간 정리용, 일 단위)
+        
+        Args:
+            cutoff: 이 날짜 이전 파티션을 제거
+            before_commit: 제거하기 전에 제거할 레코드로 호출할 함수 (예: 아카이브 기록,
+                예외가 발생하면 아무것도 제거하지 않음)
+            
+        Returns:
+            DataFrame: 제거된 레코드
+        """
+        self.flush()
+        cutoff_day = pd.Timestamp(cutoff).strftime('%Y-%m-%d')
+        partitions, frames = [], []
+        with self._compact_lock, self._lock:
+            for partition in self._partitions():
+                if partition.name[len('date='):] >= cutoff_day:
+                    continue
+                partitions.append(partition)
+                files = sorted(partition.glob('*.parquet'))
+                if files:
+                    frames.append(self._pa.concat_tables(
+                        self._pq.read_table(f, schema=self.schema) for f in files
+                    ).to_pandas())
+            old = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+            if before_commit is not None and not old.empty:
+                before_commit(old)
+            for partition in partitions:
+                shutil.rmtree(partition)
+        return old
+    
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+def _filter_range(df, start=None, end=None):
+    """timestamp가 [start, end) 범위인 행만 남김"""
+    if start is not None:
+        df = df[df['timestamp'] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df['timestamp'] < pd.Timestamp(end)]
+    return df
+
+
+def _with_timestamp(columns):
+    """조회 컬럼 목록에 timestamp를 포함시켜 반환 (None이면 전체 컬럼)"""
+    if columns is None:
+        return list(COLUMNS)
+    return ['timestamp'] + [c for c in columns if c != 'timestamp']
+
+
+BACKENDS = {
+    'csv': CSVHistoryBackend,
+    'sqlite': SQLiteHistoryBackend,
+    'parquet': ParquetHistoryBackend
+}
+
+
+def create_backend(name, path):
+    """
+    이름으로 이력 backend 생성
+    
+    Args:
+        name: 'csv', 'sqlite' 또는 'parquet'
+        path: 저장 파일 경로
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 HISTORY_BACKEND: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name](path)
@@ -0,0 +1,125 @@
+"""
+검사 이력 스트리밍 내보내기 (CSV / Parquet / JSONL)
+InspectionHistory.iter_history()의 청크를 받는 즉시 기록하므로 기간이 길어도 메모리 사용량이 일정함
+
+사용법 (casting_app 폴더에서):
+    python services/history_export.py --start 2026-09-01 --end 2026-10-01 --format parquet --output sept.parquet
+    python services/history_export.py --start 2026-10-01 --format jsonl --output - > history.jsonl
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from services.history_backends import TIMESTAMP_FORMAT
+
+FORMATS = ('csv', 'parquet', 'jsonl')
+
+
+def _normalize(chunk):
+    """청크마다 dtype이 달라지지 않도록 정리 (빈 image_hash가 NaN/float로 읽히는 경우 등)"""
+    if 'image_hash' in chunk.columns:
+        chunk['image_hash'] = chunk['image_hash'].fillna('').astype(str)
+    return chunk
+
+
+def export_history(history, output, fmt='csv', start=None, end=None, chunk_rows=10_000, columns=None):
+    """
+    기간 이력을 파일로 내보냄
+
+    Args:
+        history: InspectionHistory
+        output: 저장 경로 또는 파일 객체 (csv/jsonl은 텍스트, parquet은 바이너리)
+        fmt: 'csv', 'parquet' 또는 'jsonl'
+        start: 시작 시각 (포함, None이면 처음부터)
+        end: 종료 시각 (미포함, None이면 끝까지)
+        chunk_rows: 한 번에 처리하는 최대 행 수
+        columns: 내보낼 컬럼 목록 (None이면 전체, timestamp는 항상 포함)
+
+    Returns:
+        int: 내보낸 행 수
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"알 수 없는 형식: {fmt} (사용 가능: {', '.join(FORMATS)})")
+
+    chunks = (_normalize(chunk) for chunk in history.iter_history(start, end, chunk_rows, columns))
+    if fmt == 'parquet':
+        return _write_parquet(chunks, output)
+
+    close = isinstance(output, (str, Path))
+    f = open(output, 'w', encoding='utf-8', newline='') if close else output
+    try:
+        if fmt == 'csv':
+            return _write_csv(chunks, f)
+        return _write_jsonl(chunks, f)
+    finally:
+        if close:
+            f.close()
+
+
+def _write_csv(chunks, f):
+    exported = 0
+    for chunk in chunks:
+        chunk.to_csv(f, index=False, header=exported == 0, date_format=TIMESTAMP_FORMAT)
+        exported += len(chunk)
+    return exported
+
+
+def _write_jsonl(chunks, f):
+    exported = 0
+    for chunk in chunks:
+        chunk['timestamp'] = chunk['timestamp'].dt.strftime(TIMESTAMP_FORMAT)
+        # pandas 버전에 따라 마지막 줄바꿈 유무가 다르므로 직접 붙임
+        f.write(chunk.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
+        exported += len(chunk)
+    return exported
+
+
+def _write_parquet(chunks, output):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("parquet 내보내기를 사용하려면 'pip install pyarrow'가 필요합니다")
+
+    writer, exported = None, 0
+    try:
+        for chunk in chunks:
+            if writer is None:
+                # 첫 청크의 스키마를 기준으로 하고 이후 청크는 같은 스키마로 변환
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(output, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            exported += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return exported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default=config.HISTORY_BACKEND)
+    parser.add_argument("--history", default=None, help="이력 경로 (없으면 backend별 기본 경로)")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--format", choices=FORMATS, default='csv')
+    parser.add_argument("--output", required=True, help="저장 경로 ('-'이면 표준 출력, csv/jsonl만)")
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    from services.history import InspectionHistory
+    history = InspectionHistory(args.history, backend=args.backend)
+    output = sys.stdout if args.output == '-' else args.output
+    if output is sys.stdout and args.format == 'parquet':
+        parser.error("parquet 형식은 파일 경로로만 내보낼 수 있습니다")
+
+    exported = export_history(history, output, args.format, args.start, args.end, args.chunk_rows)
+    if output is not sys.stdout:
+        print(f"[OK] {exported:,}건 내보내기 완료: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+검사 이력 통계 롤업
+시간/일 단위 집계를 add_record 시점에 증분 갱신하여 통계 조회를 O(버킷 수)로 처리
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import config
+from utils.file_lock import FileLock
+
+HOUR_KEY_FORMAT = '%Y-%m-%d %H'
+DAY_KEY_FORMAT = '%Y-%m-%d'
+
+# 버킷 값: [total, defect, confidence_sum]
+TOTAL, DEFECT, CONFIDENCE_SUM = range(3)
+
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+class HistoryRollups:
+    """시간별/일별 검사 건수·불량 수·신뢰도 합계 롤업 (JSON 파일로 이력 옆에 저장)"""
+    
+    @classmethod
+    def for_path(cls, path):
+        """
+        경로별로 프로세스 내 하나의 인스턴스를 공유
+        
+        Streamlit 캐시 갱신 등으로 InspectionHistory가 다시 만들어져도
+        같은 파일을 서로 다른 메모리 상태로 덮어쓰지 않도록 함
+        """
+        key = Path(path).resolve()
+        with _instances_lock:
+            if key not in _instances:
+                _instances[key] = cls(path)
+                # 프로세스 종료 시 미저장 증분 기록 (경로별로 한 번만 등록)
+                atexit.register(_instances[key].save)
+            return _instances[key]
+    
+    def __init__(self, path, save_interval=None, hour_retention_days=None):
+        """
+        Args:
+            path: 롤업 JSON 파일 경로
+            save_interval: 파일 저장 최소 간격 (초, 없으면 config.HISTORY_ROLLUP_SAVE_INTERVAL)
+            hour_retention_days: 시간 버킷 보관 기간 (일, 없으면 config.HISTORY_ROLLUP_HOUR_RETENTION_DAYS)
+        """
+        self.path = Path(path)
+        self.save_interval = save_interval if save_interval is not None else config.HISTORY_ROLLUP_SAVE_INTERVAL
+        self.hour_retention_days = hour_retention_days or config.HISTORY_ROLLUP_HOUR_RETENTION_DAYS
+        self._file_lock = FileLock(self.path.with_name(self.path.name + '.lock'))
+        
+        self._lock = threading.Lock()
+        # 조회용 버킷 (파일 내용 + 아직 저장하지 않은 이 프로세스의 증분)
+        self._hours = {}
+        self._days = {}
+        # 아직 저장하지 않은 증분 (저장 시 파일의 최신 내용에 더함)
+        self._pending_hours = {}
+        self._pending_days = {}
+        self._file_mtime = None
+        self._last_save = time.monotonic()
+        with self._lock:
+            self.loaded = self._reload()
+    
+    def _read_file(self):
+        """롤업 파일 읽기 → (hours, days) 또는 파일이 없거나 손상되었으면 None"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._file_mtime = mtime
+        return data.get('hour', {}), data.get('day', {})
+    
+    def _reload(self):
+        """파일 내용에 미저장 증분을 더해 조회용 버킷 갱신 (self._lock 안에서 호출)"""
+        data = self._read_file()
+        if data is None:
+            self._hours = _merge({}, self._pending_hours)
+            self._days = _merge({}, self._pending_days)
+            return False
+        self._hours = _merge(data[0], self._pending_hours)
+        self._days = _merge(data[1], self._pending_days)
+        return True
+    
+    def _refresh(self):
+        """다른 프로세스가 파일을 갱신했으면 다시 읽음"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        with self._lock:
+            if mtime != self._file_mtime:
+                self._reload()
+    
+    def add(self, record):
+        """레코드 1건을 해당 시간/일 버킷에 반영"""
+        timestamp = record['timestamp']  # 'YYYY-MM-DD HH:MM:SS'
+        delta = [1, int(record['prediction'] == 1), float(record['confidence'])]
+        with self._lock:
+            for buckets, key in ((self._hours, timestamp[:13]), (self._pending_hours, timestamp[:13]),
+                                 (self._days, timestamp[:10]), (self._pending_days, timestamp[:10])):
+                _add_bucket(buckets, key, delta)
+            due = time.monotonic() - self._last_save >= self.save_interval
+        if due:
+            self.save()
+    
+    def save(self):
+        """
+        미저장 증분을 파일에 원자적으로 반영 (오래된 시간 버킷은 정리)
+        
+        여러 프로세스가 같은 파일을 공유하므로 파일 잠금 안에서
+        최신 파일 내용을 다시 읽고 이 프로세스의 증분만 더해서 기록
+        """
+        if not self._pending_hours and not self._pending_days:
+            return
+        if not self.path.parent.exists():
+            # 이력 디렉터리가 이미 삭제된 경우 (예: 임시 디렉터리를 쓰는 벤치마크 종료 시)
+            return
+        with self._file_lock, self._lock:
+            if not self._pending_hours and not self._pending_days:
+                return
+            data = self._read_file() or ({}, {})
+            cutoff = (pd.Timestamp.now() - pd.Timedelta(days=self.hour_retention_days)).strftime(HOUR_KEY_FORMAT)
+            hours = {k: v for k, v in _merge(data[0], self._pending_hours).items() if k >= cutoff}
+            days = _merge(data[1], self._pending_days)
+            self._write_file(hours, days)
+            self._hours, self._days = hours, days
+            self._pending_hours, self._pending_days = {}, {}
+            self._last_save = time.monotonic()
+    
+    def _write_file(self, hours, days):
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'hour': hours, 'day': days}, f)
+        os.replace(tmp_path, self.path)
+        self._file_mtime = os.stat(self.path).st_mtime_ns
+    
+    def rebuild(self, df):
+        """
+        원본 이력으로 롤업 재계산 (필요할 때만 호출)
+        
+        Args:
+            df: timestamp, prediction, confidence 컬럼을 가진 전체 이력 DataFrame
+        """
+        hours, days = {}, {}
+        if not df.empty:
+            timestamps = pd.to_datetime(df['timestamp'])
+            grouped = df.assign(defect=(df['prediction'] == 1).astype(int))
+            for buckets, fmt in ((hours, HOUR_KEY_FORMAT), (days, DAY_KEY_FORMAT)):
+                agg = grouped.groupby(timestamps.dt.strftime(fmt)).agg(
+                    total=('prediction', 'size'), defect=('defect', 'sum'), confidence_sum=('confidence', 'sum')
+                )
+                for key, row in agg.iterrows():
+                    buckets[key] = [int(row['total']), int(row['defect']), float(row['confidence_sum'])]
+        # 원본 이력에는 이 프로세스가 이미 기록한 레코드가 모두 포함되므로 증분은 버림
+        with self._file_lock, self._lock:
+            self._write_file(hours, days)
+            self._hours, self._days = hours, days
+            self._pending_hours, self._pending_days = {}, {}
+            self.loaded = True
+    
+    def _window_buckets(self, start):
+        """
+        start 이후 구간을 덮는 버킷 목록 (시간 단위로 정렬된 경계 사용)
+        
+        첫날의 나머지 시간은 시간 버킷, 그 다음 날부터는 일 버킷을 사용.
+        시간 버킷 보관 기간보다 오래된 start는 그날 전체를 일 버킷으로 포함
+        
+        Returns:
+            list: (key, [total, defect, confidence_sum]) 목록
+        """
+        self._refresh()
+        start = pd.Timestamp(start).floor('h')
+        hour_cutoff = (pd.Timestamp.now() - pd.Timedelta(days=self.hour_retention_days)).floor('h')
+        
+        with self._lock:
+            if start < hour_cutoff:
+                first_day = start.strftime(DAY_KEY_FORMAT)
+                return [(k, v) for k, v in self._days.items() if k >= first_day]
+            
+            next_day = (start + pd.Timedelta(days=1)).normalize()
+            hour_from, hour_to = start.strftime(HOUR_KEY_FORMAT), next_day.strftime(HOUR_KEY_FORMAT)
+            day_from = next_day.strftime(DAY_KEY_FORMAT)
+            buckets = [(k, v) for k, v in self._hours.items() if hour_from <= k < hour_to]
+            buckets += [(k, v) for k, v in self._days.items() if k >= day_from]
+            return buckets
+    
+    def summarize(self, start):
+        """
+        start 이후 통계 (시간 단위 경계로 근사)
+        
+        Returns:
+            dict: total, normal, defect, confidence_sum
+        """
+        total = defect = 0
+        confidence_sum = 0.0
+        for _, bucket in self._window_buckets(start):
+            total += bucket[TOTAL]
+            defect += bucket[DEFECT]
+            confidence_sum += bucket[CONFIDENCE_SUM]
+        return {'total': total, 'normal': total - defect, 'defect': defect, 'confidence_sum': confidence_sum}
+    
+    def hourly_counts(self, start):
+        """
+        start 이후 시간대(0~23시)별 클래스별 검사 건수
+        
+        Returns:
+            DataFrame: index=hour, columns=클래스 이름 (검사가 있는 시간대만)
+        """
+        self._refresh()
+        start_key = pd.Timestamp(start).floor('h').strftime(HOUR_KEY_FORMAT)
+        rows = {}
+        with self._lock:
+            for key, bucket in self._hours.items():
+                if key < start_key:
+                    continue
+                hour = int(key[11:13])
+                counts = rows.setdefault(hour, [0, 0])
+                counts[0] += bucket[TOTAL] - bucket[DEFECT]
+                counts[1] += bucket[DEFECT]
+        
+        df = pd.DataFrame.from_dict(rows, orient='index', columns=config.CLASS_NAMES).sort_index()
+        df.index.name = 'hour'
+        # 원본 집계와 동일하게 한 번도 나오지 않은 클래스 컬럼은 제외
+        return df.loc[:, (df > 0).any(axis=0)]
+
+
+def _add_bucket(buckets, key, delta):
+    bucket = buckets.setdefault(key, [0, 0, 0.0])
+    bucket[TOTAL] += delta[TOTAL]
+    bucket[DEFECT] += delta[DEFECT]
+    bucket[CONFIDENCE_SUM] += delta[CONFIDENCE_SUM]
+
+
+def _merge(base, pending):
+    """base 버킷에 pending 증분을 더한 새 dict"""
+    merged = {key: list(bucket) for key, bucket in base.items()}
+    for key, delta in pending.items():
+        _add_bucket(merged, key, delta)
+    return merged
@@ -0,0 +1,183 @@
+"""
+검사 이력 비동기 기록기 (write-behind)
+검사 결과 반환 경로에서 디스크 쓰기를 분리하여 백그라운드 스레드에서 배치로 기록
+"""
+import atexit
+import json
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import config
+from utils.file_lock import FileLock
+
+FULL_POLICIES = ('block', 'drop', 'spill')
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+class HistoryWriter:
+    """제한된 크기의 메모리 큐 + N건 또는 T밀리초마다 한 번에 기록하는 백그라운드 기록기"""
+    
+    @classmethod
+    def for_history(cls, history):
+        """
+        이력 파일별로 프로세스 내 하나의 기록기를 공유
+        (오케스트레이터가 다시 만들어져도 기록 스레드가 늘어나지 않도록)
+        """
+        key = Path(history.history_file).resolve()
+        with _instances_lock:
+            if key not in _instances:
+                _instances[key] = cls(history)
+            return _instances[key]
+    
+    def __init__(self, history, max_queue=None, batch_size=None, flush_interval_ms=None,
+                 full_policy=None, spill_path=None):
+        """
+        Args:
+            history: InspectionHistory
+            max_queue: 큐 최대 크기 (없으면 config.HISTORY_WRITER_MAX_QUEUE)
+            batch_size: 한 번에 기록할 최대 건수 (없으면 config.HISTORY_WRITER_BATCH_SIZE)
+            flush_interval_ms: 최대 기록 지연 (ms, 없으면 config.HISTORY_WRITER_FLUSH_INTERVAL_MS)
+            full_policy: 큐가 가득 찼을 때 정책 'block' | 'drop' | 'spill'
+                (없으면 config.HISTORY_WRITER_FULL_POLICY)
+            spill_path: 'spill' 정책에서 넘친 레코드를 임시 저장할 JSONL 경로
+        """
+        self.history = history
+        self.batch_size = batch_size or config.HISTORY_WRITER_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or config.HISTORY_WRITER_FLUSH_INTERVAL_MS) / 1000.0
+        self.full_policy = full_policy or config.HISTORY_WRITER_FULL_POLICY
+        if self.full_policy not in FULL_POLICIES:
+            raise ValueError(f"알 수 없는 HISTORY_WRITER_FULL_POLICY: {self.full_policy}")
+        self.spill_path = Path(spill_path or f"{history.history_file}.spill.jsonl")
+        
+        self._queue = queue.Queue(maxsize=max_queue or config.HISTORY_WRITER_MAX_QUEUE)
+        self._stop = threading.Event()
+        self._spill_lock = FileLock(self.spill_path.with_name(self.spill_path.name + '.lock'))
+        self._metrics_lock = threading.Lock()
+        self._flush_latencies = deque(maxlen=1000)
+        self._flushed = 0
+        self._dropped = 0
+        self._spilled = 0
+        self._errors = 0
+        
+        self._worker = threading.Thread(target=self._run, name='HistoryWriter', daemon=True)
+        self._worker.start()
+        # 프로세스 종료 시 큐에 남은 레코드를 모두 기록
+        atexit.register(self.close)
+    
+    def submit(self, result):
+        """
+        검사 결과를 기록 큐에 추가 (디스크 쓰기를 기다리지 않음)
+        
+        Args:
+            result: run_inspection()의 결과
+            
+        Returns:
+            bool: 큐 또는 spill 파일에 들어갔으면 True, 'drop' 정책으로 버려졌으면 False
+        """
+        record = self.history.to_record(result)
+        if self._stop.is_set():
+            # 종료 이후에는 동기로 기록
+            self.history.add_records([record])
+            return True
+        
+        if self.full_policy == 'block':
+            self._queue.put(record)
+            return True
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            pass
+        
+        with self._metrics_lock:
+            if self.full_policy == 'drop':
+                self._dropped += 1
+                return False
+            self._spilled += 1
+        with self._spill_lock:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return True
+    
+    def _collect_batch(self):
+        """첫 레코드를 기다린 뒤 batch_size건 또는 flush_interval까지 수집"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if self._queue.empty():
+                # 큐에 여유가 생기면 넘쳤던 레코드를 이어서 기록
+                batch += self._drain_spill()
+            if batch:
+                self._write(batch)
+        self._write(self._drain_spill())
+    
+    def _drain_spill(self):
+        """spill 파일의 레코드를 읽고 파일 삭제"""
+        with self._spill_lock:
+            if not self.spill_path.exists():
+                return []
+            with open(self.spill_path, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+            self.spill_path.unlink()
+        return records
+    
+    def _write(self, batch):
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            self.history.add_records(batch)
+        except Exception as e:
+            # 이력 저장 실패는 검사 프로세스를 중단시키지 않음
+            print(f"Warning: 이력 저장 실패 ({len(batch)}건) - {e}")
+            with self._metrics_lock:
+                self._errors += len(batch)
+            return
+        with self._metrics_lock:
+            self._flushed += len(batch)
+            self._flush_latencies.append((time.perf_counter() - start) * 1000)
+    
+    def get_metrics(self):
+        """
+        기록기 지표
+        
+        Returns:
+            dict: 큐 깊이, 기록/버림/spill/실패 건수, 배치 기록 지연 평균/p99 (ms)
+        """
+        with self._metrics_lock:
+            latencies = list(self._flush_latencies)
+            return {
+                'queue_depth': self._queue.qsize(),
+                'flushed': self._flushed,
+                'dropped': self._dropped,
+                'spilled': self._spilled,
+                'errors': self._errors,
+                'flush_latency_avg_ms': float(np.mean(latencies)) if latencies else 0.0,
+                'flush_latency_p99_ms': float(np.percentile(latencies, 99)) if latencies else 0.0
+            }
+    
+    def close(self, timeout=None):
+        """큐에 남은 레코드를 모두 기록한 뒤 종료"""
+        self._stop.set()
+        self._worker.join(timeout)
@@ -0,0 +1,155 @@
+"""
+마이크로 배치 추론 스케줄러
+여러 세션/라인에서 동시에 들어오는 분류 요청을 모아 한 번의 배치로 처리
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+import config
+
+
+class _PendingRequest:
+    """대기열에 들어간 단일 분류 요청"""
+
+    __slots__ = ('image', 'future', 'enqueued_at')
+
+    def __init__(self, image):
+        self.image = image
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatchScheduler:
+    """최대 배치 크기 또는 최대 대기 시간에 도달하면 요청을 한 번에 flush"""
+
+    def __init__(self, classifier, max_batch_size=None, max_wait_ms=None, metrics_window=1000):
+        """
+        Args:
+            classifier: predict_batch()를 제공하는 ImageClassifier
+            max_batch_size: 한 번에 처리할 최대 요청 수
+            max_wait_ms: 첫 요청 이후 배치를 모으는 최대 대기 시간 (ms)
+            metrics_window: 지표 계산에 사용할 최근 배치/요청 수
+        """
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size or config.SCHEDULER_MAX_BATCH_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.SCHEDULER_MAX_WAIT_MS) / 1000.0
+
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=metrics_window)
+        self._queue_waits = deque(maxlen=metrics_window)
+        self._total_batches = 0
+        self._total_requests = 0
+
+        self._worker = threading.Thread(target=self._run, name='MicroBatchScheduler', daemon=True)
+        self._worker.start()
+
+    def submit(self, image):
+        """
+        분류 요청 등록
+
+        Args:
+            image: PIL Image 또는 prepare_array() 배열
+
+        Returns:
+            Future: predict() 결과 dict를 담는 Future
+        """
+        request = _PendingRequest(image)
+        # shutdown()과 같은 잠금 안에서 확인하므로 워커 종료 후에 대기열에 들어가는 요청이 없음
+        with self._lock:
+            if self._stop.is_set():
+                raise RuntimeError("스케줄러가 이미 종료되었습니다")
+            self._queue.put(request)
+        return request.future
+
+    def predict(self, image, timeout=None):
+        """ImageClassifier.predict()와 동일한 형태로 결과를 동기 반환"""
+        return self.submit(image).result(timeout=timeout)
+
+    def _collect_batch(self):
+        """첫 요청을 기다린 뒤, 배치가 가득 차거나 대기 시간이 끝날 때까지 요청 수집"""
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if batch:
+                self._flush(batch)
+
+        # 남은 요청이 있으면 Future가 영원히 대기하지 않도록 실패 처리
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            request.future.set_exception(RuntimeError("스케줄러가 종료되어 요청을 처리하지 못했습니다"))
+
+    def _flush(self, batch):
+        """수집된 요청을 한 번의 forward로 처리하고 각 Future에 결과 전달"""
+        started = time.perf_counter()
+        with self._lock:
+            self._total_batches += 1
+            self._total_requests += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._queue_waits.extend((started - r.enqueued_at) * 1000 for r in batch)
+
+        try:
+            results = self.classifier.predict_batch([r.image for r in batch], batch_size=len(batch))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
+
+    def get_metrics(self):
+        """
+        배치 크기 및 대기열 대기 시간 지표
+
+        Returns:
+            dict: 누적 배치/요청 수, 최근 배치 크기 평균, 대기 시간 p50/p99 (ms)
+        """
+        with self._lock:
+            sizes = list(self._batch_sizes)
+            waits = list(self._queue_waits)
+            total_batches = self._total_batches
+            total_requests = self._total_requests
+
+        return {
+            'total_batches': total_batches,
+            'total_requests': total_requests,
+            'queue_depth': self._queue.qsize(),
+            'avg_batch_size': float(np.mean(sizes)) if sizes else 0.0,
+            'max_batch_size': max(sizes) if sizes else 0,
+            'queue_wait_p50_ms': float(np.percentile(waits, 50)) if waits else 0.0,
+            'queue_wait_p99_ms': float(np.percentile(waits, 99)) if waits else 0.0
+        }
+
+    def shutdown(self, wait=True):
+        """남은 요청을 모두 처리한 뒤 워커 종료"""
+        with self._lock:
+            self._stop.set()
+        if wait:
+            self._worker.join()
@@ -2,12 +2,19 @@
 검사 워크플로우 오케스트레이터
 모든 비즈니스 로직을 조율하는 중앙 관리자
 """
+from functools import partial
+
 import config
 from classifiers.image_classifier import ImageClassifier
-from explainers.gradcam import GradCAMGenerator
+from classifiers.inspection_result import InspectionResult
+from explainers.gradcam import GradCAMGenerator, LazyCamImage, overlay_cam_map, resolve_cam_image
 from services.analyzer import DefectAnalyzer
 from services.pdf_generator import PDFReportGenerator
 from services.history import InspectionHistory
+from services.history_writer import HistoryWriter
+from services.blob_store import BlobStore
+from services.inference_scheduler import MicroBatchScheduler
+from utils.preprocessing import prepare_array
 from datetime import datetime
 
 
@@ -19,10 +26,14 @@ class InspectionOrchestrator:
         # 분류기 초기화
         self.classifier = ImageClassifier(config.MODEL_PATH)
         
-        # Grad-CAM 초기화 (EfficientNet-B0의 마지막 conv layer)
-        # EfficientNet-B0: features[-1]이 아닌 features[-1][0]을 사용
-        target_layer = self.classifier.model.features[-1]
-        self.explainer = GradCAMGenerator(self.classifier.model, target_layer)
+        # 동시 요청을 모아 배치로 추론하는 스케줄러 (선택)
+        self.scheduler = MicroBatchScheduler(self.classifier) if config.USE_BATCH_SCHEDULER else None
+        
+        # Grad-CAM은 처음 필요할 때 초기화 (explainer 프로퍼티 참고)
+        self._explainer = None
+        self.explain_policy = config.EXPLAIN_POLICY
+        if self.explain_policy not in ('always', 'defects_only', 'low_confidence', 'on_demand'):
+            raise ValueError(f"알 수 없는 EXPLAIN_POLICY: {self.explain_policy}")
         
         # 분석기 및 리포트 생성기
         self.analyzer = DefectAnalyzer()
@@ -30,28 +41,115 @@ class InspectionOrchestrator:
         
         # 검사 이력 관리
         self.history = InspectionHistory()
+        self.history_writer = HistoryWriter.for_history(self.history) if config.HISTORY_ASYNC_WRITES else None
+        
+        # 썸네일/Grad-CAM/분석 텍스트 저장소 (이력의 image_hash로 연결)
+        self.blob_store = BlobStore() if config.BLOB_STORE_ENABLED else None
+    
+    @property
+    def explainer(self):
+        """Grad-CAM 생성기 (eager 이외의 backend에서는 eager 모델 로드를 필요 시점까지 지연)"""
+        if self._explainer is None:
+            # Grad-CAM 초기화 (EfficientNet-B0의 마지막 conv layer = features 출력)
+            self._explainer = GradCAMGenerator(self.classifier.model.features, self.classifier.head)
+        return self._explainer
     
     def run_inspection(self, image):
         # 1. 검사 시간 기록
         inspection_time = datetime.now()
         
-        # 2. AI 예측 수행
-        result = self.classifier.predict(image)
-        result['inspection_time'] = inspection_time
+        # 리사이즈는 한 번만 수행하고 분류기와 Grad-CAM 오버레이가 같은 배열을 사용
+        image_array = prepare_array(image)
+        
+        # 2~3. AI 예측 + Grad-CAM 히트맵 생성
+        eager = self.scheduler is None and self.classifier.backend == 'eager'
+        if eager and self.explain_policy == 'always':
+            # 한 번의 forward로 예측과 Grad-CAM을 함께 계산
+            result = self.classifier.predict_with_cam(image_array, self.explainer)
+        else:
+            if eager:
+                # 특징 맵을 보관해 두고 Grad-CAM이 필요하면 head만 다시 계산 (backbone forward 1회)
+                result, cam_input = self.classifier.predict_with_features(image_array)
+                generate = partial(self._generate_cam_from_features, result)
+            else:
+                # 스케줄러/그래프 backend 사용 시 예측과 Grad-CAM을 별도로 수행
+                if self.scheduler is not None:
+                    result = self.scheduler.predict(image_array)
+                else:
+                    result = self.classifier.predict(image_array)
+                cam_input = result.input_tensor
+                generate = partial(self._generate_cam, result)
+            
+            if self._should_explain(result):
+                result.cam_image = generate(cam_input, image_array)
+            else:
+                result.cam_image = LazyCamImage(generate, cam_input, image_array)
+        # 입력 텐서는 Grad-CAM 계산에만 필요 (지연 생성 시에는 LazyCamImage가 보관)
+        result.release_tensors()
+        result.inspection_time = inspection_time
         
-        # 3. Grad-CAM 히트맵 생성
-        cam_image = self.explainer.generate(result['input_tensor'], image)
-        result['cam_image'] = cam_image
+        # 4. 썸네일/Grad-CAM 보관 (보고서 재생성용)
+        if self.blob_store is not None:
+            result.image_hash = BlobStore.key_for(image_array)
+            try:
+                self.blob_store.put_thumbnail(result.image_hash, image)
+                if result.get('cam_map') is not None:
+                    self.blob_store.put_cam(result.image_hash, result.cam_map)
+            except Exception as e:
+                print(f"Warning: 결과 페이로드 저장 실패 - {e}")
         
-        # 4. 검사 이력 저장
+        # 5. 검사 이력 저장
         try:
-            self.history.add_record(result)
+            if self.history_writer is not None:
+                self.history_writer.submit(result)
+            else:
+                self.history.add_record(result)
         except Exception as e:
             # 이력 저장 실패는 전체 프로세스를 중단시키지 않음
             print(f"Warning: 이력 저장 실패 - {e}")
         
         return result
     
+    def _generate_cam(self, result, input_tensor, image):
+        """
+        Grad-CAM 생성 (LazyCamImage에서는 explainer 초기화도 이 시점까지 지연)
+        
+        오버레이 전의 uint8 히트맵은 result.cam_map에 남겨 페이로드 보관에 사용
+        """
+        result.cam_map = self.explainer.generate_map(input_tensor)
+        return overlay_cam_map(image, result.cam_map)
+    
+    def _generate_cam_from_features(self, result, features, image):
+        """predict_with_features()의 특징 맵으로 Grad-CAM 생성 (head만 다시 계산)"""
+        result.cam_map = self.explainer.generate_map_from_features(features, image.shape[:2])
+        return overlay_cam_map(image, result.cam_map)
+    
+    def _should_explain(self, result):
+        """EXPLAIN_POLICY에 따라 Grad-CAM을 즉시 생성할지 결정"""
+        if self.explain_policy == 'always':
+            return True
+        if self.explain_policy == 'defects_only':
+            return result.prediction == 1
+        if self.explain_policy == 'low_confidence':
+            return result.confidence < config.EXPLAIN_CONFIDENCE_THRESHOLD
+        return False
+    
+    def get_cam_image(self, result):
+        """
+        Grad-CAM 이미지 조회 (지연 생성된 경우 이 시점에 계산)
+        
+        Args:
+            result: run_inspection()의 결과
+            
+        Returns:
+            numpy.ndarray: Grad-CAM 이미지
+        """
+        if isinstance(result['cam_image'], LazyCamImage):
+            result['cam_image'] = result['cam_image'].get()
+            if self.blob_store is not None and result.get('image_hash') and result.get('cam_map') is not None:
+                self.blob_store.put_cam(result['image_hash'], result['cam_map'])
+        return result['cam_image']
+    
     def generate_ai_analysis(self, result):
         """
         Claude AI를 사용한 상세 분석 리포트 생성
@@ -62,7 +160,26 @@ class InspectionOrchestrator:
         Returns:
             str: 마크다운 형식의 분석 리포트
         """
-        return self.analyzer.run_analysis(result)
+        report = self.analyzer.run_analysis(result)
+        if self.blob_store is not None and result.get('image_hash'):
+            self.blob_store.put_analysis(result['image_hash'], report)
+        return report
+    
+    def generate_ai_analysis_stream(self, result):
+        """
+        Claude AI 상세 분석 리포트 생성 (스트리밍)
+        
+        Args:
+            result: run_inspection()의 결과
+            
+        Yields:
+            str: 지금까지 생성된 마크다운 리포트 (마지막 값이 완성본)
+        """
+        report = None
+        for report in self.analyzer.run_analysis_stream(result):
+            yield report
+        if report is not None and self.blob_store is not None and result.get('image_hash'):
+            self.blob_store.put_analysis(result['image_hash'], report)
     
     def generate_pdf_report(self, result, analysis_report, original_image, cam_image):
         """
@@ -72,18 +189,101 @@ class InspectionOrchestrator:
             result: 검사 결과
             analysis_report: AI 분석 리포트
             original_image: 원본 이미지
-            cam_image: Grad-CAM 이미지
+            cam_image: Grad-CAM 이미지 (LazyCamImage 가능)
             
         Returns:
             BytesIO: PDF 파일 버퍼
         """
+        if cam_image is result.get('cam_image'):
+            # 지연 생성된 Grad-CAM도 보관되도록 get_cam_image()를 거침
+            cam_image = self.get_cam_image(result)
         return self.pdf_generator.generate_report(
             result, 
             analysis_report, 
             original_image, 
-            cam_image
+            resolve_cam_image(cam_image)
         )
     
+    def get_stored_payload(self, image_hash):
+        """
+        보관된 썸네일/Grad-CAM/분석 텍스트 조회
+        
+        Args:
+            image_hash: 이력의 image_hash 값
+            
+        Returns:
+            dict: {'thumbnail', 'cam_image', 'analysis'} (없는 항목은 None)
+        """
+        if self.blob_store is None or not image_hash:
+            return {'thumbnail': None, 'cam_image': None, 'analysis': None}
+        payload = self.blob_store.get(image_hash)
+        cam_map = payload.pop('cam_map')
+        if cam_map is not None and payload['thumbnail'] is not None:
+            # 보관된 uint8 히트맵을 썸네일 위에 다시 채색
+            payload['cam_image'] = overlay_cam_map(payload['thumbnail'], cam_map)
+        return payload
+    
+    def regenerate_pdf_report(self, record):
+        """
+        과거 검사 이력 한 건으로 PDF 보고서 재생성 (모델/LLM 재실행 없이 보관된 페이로드 사용)
+        
+        Args:
+            record: get_history() 결과의 한 행 (dict 또는 Series)
+            
+        Returns:
+            BytesIO: PDF 파일 버퍼
+            
+        Raises:
+            ValueError: 필요한 페이로드가 보관되어 있지 않은 경우
+        """
+        result = InspectionResult.from_record(record)
+        payload = self.get_stored_payload(result.get('image_hash'))
+        missing = [name for name in ('thumbnail', 'cam_image', 'analysis') if payload[name] is None]
+        if missing:
+            raise ValueError(f"보관된 페이로드가 없어 보고서를 재생성할 수 없습니다: {', '.join(missing)}")
+        return self.pdf_generator.generate_report(
+            result,
+            payload['analysis'],
+            payload['thumbnail'],
+            payload['cam_image']
+        )
+    
+    def get_scheduler_metrics(self):
+        """
+        마이크로 배치 스케줄러 지표 조회
+        
+        Returns:
+            dict: 배치 크기/대기 시간 지표 (스케줄러 미사용 시 None)
+        """
+        return self.scheduler.get_metrics() if self.scheduler is not None else None
+    
+    def get_history_writer_metrics(self):
+        """
+        이력 비동기 기록기 지표 조회
+        
+        Returns:
+            dict: 큐 깊이/기록 지연 지표 (비동기 기록 미사용 시 None)
+        """
+        return self.history_writer.get_metrics() if self.history_writer is not None else None
+    
+    def get_llm_cache_metrics(self):
+        """
+        LLM 응답 캐시 지표 조회
+        
+        Returns:
+            dict: 적중률/항목 수 지표 (캐시 미사용 시 None)
+        """
+        return self.analyzer.get_cache_metrics()
+    
+    def get_llm_client_metrics(self):
+        """
+        LLM 클라이언트 지표 조회
+        
+        Returns:
+            dict: 지연 시간/재시도/서킷 브레이커 지표 (LLM_CLIENT_MODE='async'가 아니면 None)
+        """
+        return self.analyzer.get_client_metrics()
+    
     def get_statistics(self, days=1):
         """
         검사 통계 조회
@@ -107,3 +307,28 @@ class InspectionOrchestrator:
             DataFrame: 검사 이력
         """
         return self.history.get_history(days=days)
+    
+    def get_hourly_counts(self, days=1):
+        """
+        시간대별 검사 건수 조회
+        
+        Args:
+            days: 조회 기간 (일)
+            
+        Returns:
+            DataFrame: index=hour, columns=클래스 이름
+        """
+        return self.history.get_hourly_counts(days=days)
+    
+    def get_recent_records(self, limit=10, days=None):
+        """
+        최근 검사 이력 조회
+        
+        Args:
+            limit: 최대 건수
+            days: 조회 기간 (일)
+            
+        Returns:
+            DataFrame: 최근 검사 이력
+        """
+        return self.history.get_recent_records(limit=limit, days=days)
@@ -0,0 +1,72 @@
+"""
+CSV 검사 이력 → SQLite 일괄 이전
+
+사용법 (casting_app 폴더에서):
+    python services/migrate_history.py
+    python services/migrate_history.py --csv inspection_history.csv --db inspection_history.db
+    python services/migrate_history.py --force   # 이미 이력이 있는 DB에 그대로 추가
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+import config
+from services.history_backends import COLUMNS, SQLiteHistoryBackend
+
+
+def migrate_csv_to_sqlite(csv_path, db_path, chunk_rows=100_000, force=False):
+    """
+    CSV 이력을 청크 단위로 읽어 SQLite에 추가 (메모리 사용량은 청크 크기로 제한)
+    
+    Args:
+        csv_path: 원본 CSV 경로
+        db_path: 대상 SQLite 경로 (없으면 생성)
+        chunk_rows: 한 번에 읽고 쓰는 행 수
+        force: True이면 이미 이력이 있는 DB에도 추가 (다시 실행하면 같은 행이 중복됨)
+        
+    Returns:
+        int: 이전된 행 수
+        
+    Raises:
+        ValueError: 대상 DB에 이미 이력이 있고 force가 아닌 경우
+    """
+    backend = SQLiteHistoryBackend(db_path)
+    migrated = 0
+    try:
+        if not force and not backend.recent(1).empty:
+            raise ValueError(f"대상 DB에 이미 이력이 있습니다: {db_path} (그래도 추가하려면 --force)")
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+            # timestamp 형식을 정규화하여 문자열 비교로 기간 조회가 가능하도록 저장
+            chunk['timestamp'] = pd.to_datetime(chunk['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            # 이미지 해시 컬럼이 없던 이전 형식의 CSV도 이전 가능하도록 빈 값으로 채움
+            chunk = chunk.reindex(columns=COLUMNS)
+            chunk['image_hash'] = chunk['image_hash'].fillna('')
+            backend.append_many(chunk.to_dict('records'))
+            migrated += len(chunk)
+    finally:
+        backend.close()
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=config.HISTORY_PATHS['csv'])
+    parser.add_argument("--db", default=config.HISTORY_PATHS['sqlite'])
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--force", action="store_true", help="이미 이력이 있는 DB에도 추가 (중복 가능)")
+    args = parser.parse_args()
+
+    try:
+        migrated = migrate_csv_to_sqlite(args.csv, args.db, args.chunk_rows, force=args.force)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print(f"[OK] {migrated:,}건 이전 완료: {args.csv} → {args.db}")
+    print("     HISTORY_BACKEND=sqlite 로 설정하면 SQLite 이력을 사용합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+프로세스 간 파일 잠금 (advisory lock)
+여러 Streamlit 워커/라인 에이전트가 같은 이력 파일에 쓸 때 사용
+"""
+import os
+import threading
+import time
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    잠금 파일 기반 배타 잠금 (with 문으로 사용)
+    
+    POSIX는 flock, Windows는 msvcrt.locking 사용.
+    같은 프로세스의 여러 스레드 사이에서도 배타적으로 동작
+    """
+    
+    def __init__(self, path):
+        """
+        Args:
+            path: 잠금 파일 경로 (없으면 생성)
+        """
+        self.path = str(path)
+        self._thread_lock = threading.Lock()
+        self._file = None
+    
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            self._file = open(self.path, 'a+b')
+            if os.name == 'nt':
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK은 약 10초 재시도 후 실패하므로 계속 대기
+                        time.sleep(0.05)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except BaseException:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            raise
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if os.name == 'nt':
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+            self._thread_lock.release()
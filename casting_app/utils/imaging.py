@@ -2,15 +2,20 @@
 공용 이미지 유틸리티
 """
 from PIL import Image
-from torchvision import transforms
-import config
 
-def get_inference_transform():
-    return transforms.Compose([
-        transforms.Resize(config.IMAGE_SIZE),
-        transforms.ToTensor(),
-        transforms.Normalize(config.NORMALIZE_MEAN, config.NORMALIZE_STD)
-    ])
+def load_image(image_path, max_size=None):
+    """
+    이미지 로드 (RGB)
 
-def load_image(image_path):
-    return Image.open(image_path).convert('RGB')
+    Args:
+        image_path: 파일 경로 또는 파일 객체
+        max_size: (width, height). 지정하면 JPEG은 DCT 단계에서 1/2, 1/4, 1/8로 축소 디코딩하여
+            이 크기 이상인 가장 작은 해상도로 읽음 (모델 입력만 필요할 때 사용)
+
+    Returns:
+        PIL.Image: RGB 이미지
+    """
+    image = Image.open(image_path)
+    if max_size is not None and image.format == 'JPEG':
+        image.draft('RGB', tuple(max_size))
+    return image.convert('RGB')
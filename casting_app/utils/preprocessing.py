@@ -0,0 +1,57 @@
+"""
+uint8 기반 전처리 파이프라인
+이미지를 한 번만 IMAGE_SIZE로 리사이즈한 uint8 배열을 분류기와 Grad-CAM 오버레이가 공유
+(torchvision의 Resize → ToTensor → Normalize와 같은 결과)
+"""
+import numpy as np
+import torch
+from PIL import Image
+import config
+
+# ToTensor(÷255)와 Normalize((x - mean) / std)를 하나의 x * scale + bias로 합침
+_SCALE = (1.0 / (255.0 * torch.tensor(config.NORMALIZE_STD))).view(1, 3, 1, 1)
+_BIAS = (-torch.tensor(config.NORMALIZE_MEAN) / torch.tensor(config.NORMALIZE_STD)).view(1, 3, 1, 1)
+
+
+def prepare_array(image):
+    """
+    이미지를 IMAGE_SIZE의 uint8 RGB 배열로 변환 (이미 변환된 배열은 그대로 반환)
+
+    Args:
+        image: PIL Image 또는 prepare_array()가 반환한 numpy 배열
+
+    Returns:
+        numpy.ndarray: (H, W, 3) uint8
+    """
+    height, width = config.IMAGE_SIZE
+    if isinstance(image, np.ndarray):
+        if image.shape != (height, width, 3) or image.dtype != np.uint8:
+            raise ValueError(f"(H, W, 3) uint8 배열이 필요합니다: {image.shape} {image.dtype}")
+        return image
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    # transforms.Resize와 동일하게 bilinear 보간 (PIL은 항상 antialias 적용)
+    return np.array(image.resize((width, height), Image.BILINEAR))
+
+
+def array_to_tensor(arrays, device=None):
+    """
+    uint8 배열을 정규화된 float32 NCHW 텐서로 변환
+
+    uint8 상태로 디바이스에 올린 뒤 float 변환 1회 + in-place 곱/덧셈만 수행하여
+    ToTensor/Normalize의 중간 float 텐서를 만들지 않음
+
+    Args:
+        arrays: (H, W, 3) 또는 (N, H, W, 3) uint8 배열
+        device: 대상 디바이스
+
+    Returns:
+        torch.Tensor: (N, 3, H, W) float32
+    """
+    x = torch.from_numpy(arrays)
+    if x.ndim == 3:
+        x = x.unsqueeze(0)
+    if device is not None:
+        x = x.to(device)
+    x = x.permute(0, 3, 1, 2).to(torch.float32, memory_format=torch.contiguous_format)
+    return x.mul_(_SCALE.to(x.device)).add_(_BIAS.to(x.device))